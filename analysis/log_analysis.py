@@ -1,3 +1,18 @@
+from typing import Iterable, Iterator, TextIO, Union
+
+from analysis.log_templates import LogTemplateMiner, extract_timestamp
+
+# ----------------------
+# Streaming Defaults
+# ----------------------
+
+DEFAULT_TOP_K = 20
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MiB of text per read()
+
+# Distinct error signatures tracked while streaming
+TRACKED_PER_TOP_K = 50
+
+
 def analyze_logs(log_lines: list[str]) -> dict:
     error_count = 0
     warning_count = 0
@@ -16,3 +31,56 @@ def analyze_logs(log_lines: list[str]) -> dict:
         "key_errors": key_errors,
         "summary": "Multiple errors detected in logs" if error_count > 0 else "No critical log errors"
     }
+
+
+# ----------------------
+# Streaming Analysis
+# ----------------------
+
+def iter_log_lines(f: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    # Reads fixed-size chunks so memory is bounded by chunk_size plus the
+    # longest single line, not by the file size.
+    pending = ""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        lines = (pending + chunk).split("\n")
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
+def analyze_log_stream(
+    source: Union[TextIO, Iterable[str]],
+    top_k: int = DEFAULT_TOP_K,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> dict:
+    # Same result shape as analyze_logs, but ERROR lines are clustered into
+    # templates: key_errors holds the top_k templates and error_signatures
+    # carries their counts, first/last seen timestamps and a raw sample.
+    lines = iter_log_lines(source, chunk_size) if hasattr(source, "read") else source
+
+    error_count = 0
+    warning_count = 0
+    miner = LogTemplateMiner(max_clusters=top_k * TRACKED_PER_TOP_K)
+
+    for line in lines:
+        if "ERROR" in line:
+            error_count += 1
+            miner.add(line.split("ERROR")[1].strip(), extract_timestamp(line))
+        elif "WARN" in line:
+            warning_count += 1
+
+    return build_log_analysis(error_count, warning_count, miner.signatures(top_k))
+
+
+def build_log_analysis(error_count: int, warning_count: int, signatures: list[dict]) -> dict:
+    return {
+        "error_count": error_count,
+        "warning_count": warning_count,
+        "key_errors": [s["template"] for s in signatures],
+        "error_signatures": signatures,
+        "summary": "Multiple errors detected in logs" if error_count > 0 else "No critical log errors"
+    }
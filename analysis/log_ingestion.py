@@ -0,0 +1,138 @@
+# analysis/log_ingestion.py
+
+import gzip
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from pathlib import Path
+from typing import Callable, Iterable, Optional, TextIO
+
+from analysis.log_analysis import DEFAULT_TOP_K, analyze_log_stream, build_log_analysis
+from analysis.log_scan import analyze_log_mmap
+
+LOG_DIR = "data/logs"
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+# ----------------------
+# Sources
+# ----------------------
+
+# The live log, its rotations (auth-service.log.1) and per-pod logs
+# (auth-service-pod-2.log.gz); spelled out so "api" doesn't pick up
+# api-gateway.log
+LOG_FILE_PATTERNS = ["{service}.log*", "{service}-pod-*.log*"]
+
+
+def find_log_files(service: str, log_dir: str = LOG_DIR) -> list[str]:
+    return sorted({
+        str(p)
+        for pattern in LOG_FILE_PATTERNS
+        for p in Path(log_dir).glob(pattern.format(service=service))
+        if p.is_file()
+    })
+
+
+def is_gzip(path: str) -> bool:
+    # Sniff the magic bytes rather than trusting the extension; rotated
+    # archives are not always named .gz
+    with open(path, "rb") as f:
+        return f.read(2) == GZIP_MAGIC
+
+
+def open_log(path: str) -> TextIO:
+    if is_gzip(path):
+        return gzip.open(path, "rt", errors="replace")
+    return open(path, "r", errors="replace")
+
+
+def analyze_log_file(path: str, top_k: int = DEFAULT_TOP_K) -> dict:
+    if not is_gzip(path):
+        return analyze_log_mmap(path, top_k=top_k)
+    with open_log(path) as f:
+        return analyze_log_stream(f, top_k=top_k)
+
+
+# ----------------------
+# Reducer
+# ----------------------
+
+EMPTY_LOG_ANALYSIS = build_log_analysis(0, 0, [])
+
+
+def _signatures(analysis: dict) -> list[dict]:
+    if "error_signatures" in analysis:
+        return analysis["error_signatures"]
+    # Plain analyze_logs output: every key error counts once
+    return [
+        {"template": e, "count": 1, "first_seen": None, "last_seen": None, "sample": e}
+        for e in analysis.get("key_errors", [])
+    ]
+
+
+def _earliest(a: Optional[str], b: Optional[str]) -> Optional[str]:
+    if a is None or b is None:
+        return a or b
+    return min(a, b)
+
+
+def _latest(a: Optional[str], b: Optional[str]) -> Optional[str]:
+    if a is None or b is None:
+        return a or b
+    return max(a, b)
+
+
+def merge_log_analyses(a: dict, b: dict, top_k: Optional[int] = None) -> dict:
+    # Counts add and signatures combine by template, so the merge is
+    # associative and commutative; trimming to top_k is left to the caller
+    # (or passed explicitly) so partial merges don't drop counts early.
+    merged: dict[str, dict] = {}
+
+    for sig in _signatures(a) + _signatures(b):
+        current = merged.get(sig["template"])
+        if current is None:
+            merged[sig["template"]] = dict(sig)
+            continue
+        current["count"] += sig["count"]
+        current["first_seen"] = _earliest(current["first_seen"], sig["first_seen"])
+        current["last_seen"] = _latest(current["last_seen"], sig["last_seen"])
+
+    signatures = sorted(merged.values(), key=lambda s: (-s["count"], s["template"]))
+    if top_k is not None:
+        signatures = signatures[:top_k]
+
+    return build_log_analysis(
+        a["error_count"] + b["error_count"],
+        a["warning_count"] + b["warning_count"],
+        signatures
+    )
+
+
+# ----------------------
+# Parallel Ingestion
+# ----------------------
+
+def run_parallel(fn: Callable, jobs: list[tuple], max_workers: Optional[int] = None) -> list:
+    # Runs fn(*job) for each job, in worker processes when there is more
+    # than one job; results come back in job order. Workers are spawned, not
+    # forked: callers run this from graph branch threads, alongside PDF
+    # render threads.
+    workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+
+    if workers <= 1:
+        return [fn(*job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) as pool:
+        return list(pool.map(fn, *zip(*jobs)))
+
+
+def ingest_logs(
+    paths: Iterable[str],
+    top_k: int = DEFAULT_TOP_K,
+    max_workers: Optional[int] = None
+) -> dict:
+    results = run_parallel(analyze_log_file, [(p, top_k) for p in paths], max_workers)
+
+    merged = reduce(merge_log_analyses, results, EMPTY_LOG_ANALYSIS)
+    return merge_log_analyses(merged, EMPTY_LOG_ANALYSIS, top_k=top_k)
@@ -0,0 +1,98 @@
+# analysis/log_scan.py
+
+import mmap
+import os
+import re
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from analysis.log_analysis import DEFAULT_TOP_K, TRACKED_PER_TOP_K, build_log_analysis
+from analysis.log_templates import LogTemplateMiner, extract_timestamp
+
+# Single-literal patterns let the regex engine skip through the raw bytes at
+# memchr speed; "[^\n]*" consumes the rest of the line so a line is matched
+# once even if the marker repeats.
+LEVEL_PATTERNS = {
+    "ERROR": re.compile(rb"ERROR[^\n]*"),
+    "WARN": re.compile(rb"WARN[^\n]*"),
+}
+
+
+@contextmanager
+def mapped_log(path: str) -> Iterator[Optional[mmap.mmap]]:
+    # Read-only mapping of the whole file, or None for an empty file (which
+    # mmap refuses to map)
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield None
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def last_line_end(path: str, start: int = 0) -> int:
+    # Offset just past the last newline at or after `start` (or `start` when
+    # no complete line follows it)
+    with mapped_log(path) as mm:
+        if mm is None or len(mm) <= start:
+            return start
+        return mm.rfind(b"\n", start) + 1 or start
+
+
+def scan_log_mmap(
+    path: str,
+    level: str = "ERROR",
+    start: int = 0,
+    end: Optional[int] = None
+) -> Iterator[memoryview]:
+    # Yields every line in [start, end) containing the level marker as a
+    # zero-copy memoryview of the mapping. Views are released as soon as the
+    # consumer moves on, so copy them (bytes(view)) to keep them.
+    pattern = LEVEL_PATTERNS[level]
+
+    with mapped_log(path) as mm:
+        if mm is None:
+            return
+        end = len(mm) if end is None else min(end, len(mm))
+
+        with memoryview(mm) as buf:
+            for match in pattern.finditer(mm, start, end):
+                line_start = mm.rfind(b"\n", start, match.start()) + 1 or start
+                view = buf[line_start:match.end()]
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+
+def count_log_lines(path: str, level: str, start: int = 0, end: Optional[int] = None) -> int:
+    with mapped_log(path) as mm:
+        if mm is None:
+            return 0
+        end = len(mm) if end is None else min(end, len(mm))
+        return sum(1 for _ in LEVEL_PATTERNS[level].finditer(mm, start, end))
+
+
+def analyze_log_mmap(
+    path: str,
+    top_k: int = DEFAULT_TOP_K,
+    start: int = 0,
+    end: Optional[int] = None
+) -> dict:
+    # Same result as analyze_log_stream over the same lines. Only ERROR lines
+    # are decoded; WARN lines are just counted, minus the ones that also
+    # carry ERROR (analyze_logs counts those as errors).
+    error_count = 0
+    error_lines_with_warn = 0
+    miner = LogTemplateMiner(max_clusters=top_k * TRACKED_PER_TOP_K)
+
+    for view in scan_log_mmap(path, "ERROR", start, end):
+        error_count += 1
+        line = str(view, "utf-8", errors="replace")
+        if "WARN" in line:
+            error_lines_with_warn += 1
+        miner.add(line.split("ERROR")[1].strip(), extract_timestamp(line))
+
+    warning_count = count_log_lines(path, "WARN", start, end) - error_lines_with_warn
+
+    return build_log_analysis(error_count, warning_count, miner.signatures(top_k))
@@ -0,0 +1,125 @@
+# analysis/log_tail.py
+
+import json
+import os
+from functools import reduce
+from pathlib import Path
+from typing import Iterable, Optional
+
+from analysis.log_analysis import DEFAULT_TOP_K, TRACKED_PER_TOP_K
+from analysis.log_ingestion import (
+    EMPTY_LOG_ANALYSIS,
+    analyze_log_file,
+    is_gzip,
+    merge_log_analyses,
+    run_parallel
+)
+from analysis.log_scan import analyze_log_mmap, last_line_end
+from observability.tracing import record
+from utils.files import file_lock, write_json_atomic
+
+CHECKPOINT_PATH = "data/checkpoints/log_offsets.json"
+
+
+# ----------------------
+# Checkpoints
+# ----------------------
+# Entries are keyed by device:inode rather than path, so a live log that is
+# renamed to .1 on rotation keeps its offset, and a new live file starts at 0.
+#
+#   {"<dev>:<ino>": {"path": ..., "offset": <bytes>, "analysis": {...}}}
+
+def load_checkpoints(path: str = CHECKPOINT_PATH) -> dict:
+    if not Path(path).exists():
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_checkpoints(checkpoints: dict, path: str = CHECKPOINT_PATH):
+    write_json_atomic(path, checkpoints)
+
+
+def file_key(st: os.stat_result) -> str:
+    return f"{st.st_dev}:{st.st_ino}"
+
+
+# ----------------------
+# Delta Analysis
+# ----------------------
+
+def analyze_log_delta(path: str, start: int, top_k: int = DEFAULT_TOP_K) -> tuple[dict, int]:
+    # Returns the analysis of complete lines appended after `start` and the
+    # offset just past the last newline; a partially written last line is
+    # left for the next run. A file logrotate removed in the meantime adds
+    # nothing.
+    try:
+        if is_gzip(path):
+            # Archives are immutable once written, so they are only read whole
+            return analyze_log_file(path, top_k), os.path.getsize(path)
+
+        end = last_line_end(path, start)
+        return analyze_log_mmap(path, top_k=top_k, start=start, end=end), end
+    except FileNotFoundError:
+        return EMPTY_LOG_ANALYSIS, start
+
+
+def tail_logs(
+    paths: Iterable[str],
+    checkpoint_path: str = CHECKPOINT_PATH,
+    top_k: int = DEFAULT_TOP_K,
+    max_workers: Optional[int] = None
+) -> dict:
+    # Same result as ingest_logs over the same files, but each file is read
+    # only from its last checkpointed offset and merged with the aggregates
+    # stored for it.
+    paths = list(paths)
+
+    # Locked from load to save: runner workers tail the same files
+    with file_lock(checkpoint_path):
+        checkpoints = load_checkpoints(checkpoint_path)
+
+        current = {}
+        keys, jobs, pending = [], [], []
+
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                # Listed, then compressed or deleted by logrotate
+                continue
+            key = file_key(st)
+            keys.append(key)
+            previous = checkpoints.get(key)
+
+            if previous and st.st_size == previous["offset"]:
+                current[key] = dict(previous, path=path)
+                continue
+
+            if previous is None or st.st_size < previous["offset"] or is_gzip(path):
+                # New file, truncated in place (copytruncate) or rewritten archive
+                jobs.append((path, 0, top_k))
+                pending.append((key, path, EMPTY_LOG_ANALYSIS))
+            else:
+                jobs.append((path, previous["offset"], top_k))
+                pending.append((key, path, previous["analysis"]))
+
+        results = run_parallel(analyze_log_delta, jobs, max_workers)
+        for (key, path, base), (_, start, _), (delta, offset) in zip(pending, jobs, results):
+            record("bytes_read", offset - start)
+            current[key] = {
+                "path": path,
+                "offset": offset,
+                "analysis": merge_log_analyses(base, delta, top_k=top_k * TRACKED_PER_TOP_K)
+            }
+
+        # Keep checkpoints for other services' files; drop ones whose file is
+        # gone or whose path now belongs to a different inode
+        for key, entry in checkpoints.items():
+            if key not in current and entry["path"] not in paths and os.path.exists(entry["path"]):
+                current[key] = entry
+
+        save_checkpoints(current, checkpoint_path)
+
+    merged = reduce(merge_log_analyses, (current[k]["analysis"] for k in keys), EMPTY_LOG_ANALYSIS)
+    return merge_log_analyses(merged, EMPTY_LOG_ANALYSIS, top_k=top_k)
@@ -0,0 +1,186 @@
+# analysis/log_templates.py
+
+import re
+from typing import Optional
+
+# ----------------------
+# Variable Masking
+# ----------------------
+# Placeholders avoid angle brackets so templates stay safe inside reportlab
+# Paragraph markup when reports are rendered.
+
+WILDCARD = "{*}"
+
+# (pattern, placeholder, literal the pattern cannot match without). The
+# literal check is a C-level substring test, so most messages skip most regexes.
+MASKS = [
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"), "{UUID}", "-"),
+    (re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b"), "{IP}", "."),
+    (re.compile(r"\b0x[0-9a-fA-F]+\b"), "{HEX}", "0x"),
+    (re.compile(r"\b(?=[0-9a-fA-F]*\d)[0-9a-fA-F]{12,}\b"), "{HEX}", None),
+    (re.compile(r"\b\d+(?:\.\d+)?(?:ms|s|%|kb|mb|gb)?\b", re.IGNORECASE), "{NUM}", None),
+]
+
+DIGIT_RE = re.compile(r"\d")
+
+TIMESTAMP_RE = re.compile(
+    r"^\s*\[?(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?)"
+)
+
+# ----------------------
+# Miner Defaults
+# ----------------------
+
+SIMILARITY_THRESHOLD = 0.5
+PREFIX_DEPTH = 2
+MAX_CLUSTERS_PER_LEAF = 32
+MAX_CHILDREN = 100
+MAX_CLUSTERS = 1000
+MAX_CACHED_MESSAGES = 10000
+
+
+def mask_message(message: str) -> str:
+    # Every mask needs at least one digit
+    if not DIGIT_RE.search(message):
+        return message
+    for pattern, placeholder, required in MASKS:
+        if required is None or required in message:
+            message = pattern.sub(placeholder, message)
+    return message
+
+
+def extract_timestamp(line: str) -> Optional[str]:
+    match = TIMESTAMP_RE.match(line)
+    return match.group(1) if match else None
+
+
+class LogCluster:
+    __slots__ = ("tokens", "count", "first_seen", "last_seen", "sample")
+
+    def __init__(self, tokens: list[str], sample: str, timestamp: Optional[str]):
+        self.tokens = tokens
+        self.count = 0
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+        self.sample = sample
+
+    @property
+    def template(self) -> str:
+        return " ".join(self.tokens)
+
+    def observe(self, timestamp: Optional[str]):
+        self.count += 1
+        if timestamp is not None:
+            if self.first_seen is None or timestamp < self.first_seen:
+                self.first_seen = timestamp
+            if self.last_seen is None or timestamp > self.last_seen:
+                self.last_seen = timestamp
+
+    def to_dict(self) -> dict:
+        return {
+            "template": self.template,
+            "count": self.count,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "sample": self.sample
+        }
+
+
+class LogTemplateMiner:
+    # Drain-style online clustering. Messages are masked, tokenised and routed
+    # through a fixed-depth prefix tree (token count, then the first tokens);
+    # each leaf holds a small, capped list of clusters, so the work per line is
+    # bounded by the line length rather than by the number of lines seen.
+
+    def __init__(
+        self,
+        similarity_threshold: float = SIMILARITY_THRESHOLD,
+        depth: int = PREFIX_DEPTH,
+        max_clusters_per_leaf: int = MAX_CLUSTERS_PER_LEAF,
+        max_children: int = MAX_CHILDREN,
+        max_clusters: int = MAX_CLUSTERS
+    ):
+        self.similarity_threshold = similarity_threshold
+        self.depth = depth
+        self.max_clusters_per_leaf = max_clusters_per_leaf
+        self.max_children = max_children
+        self.max_clusters = max_clusters
+        self.tree: dict = {}
+        self.clusters: list[LogCluster] = []
+        # Masked message -> cluster it was assigned to. Clusters only ever
+        # generalise, so a repeat of the same masked text can skip the tree.
+        self.cache: dict[str, LogCluster] = {}
+
+    def _leaf(self, tokens: list[str]) -> list[LogCluster]:
+        node = self.tree.setdefault(len(tokens), {})
+        for token in tokens[:self.depth]:
+            # Variable-looking tokens share one branch, and so does anything
+            # past max_children, so the tree width stays bounded
+            if token.startswith("{") or DIGIT_RE.search(token):
+                key = WILDCARD
+            elif token not in node and len(node) >= self.max_children:
+                key = WILDCARD
+            else:
+                key = token
+            node = node.setdefault(key, {})
+        return node.setdefault(None, [])
+
+    @staticmethod
+    def _similarity(template: list[str], tokens: list[str]) -> float:
+        same = sum(1 for a, b in zip(template, tokens) if a == b or a == WILDCARD)
+        return same / len(tokens) if tokens else 1.0
+
+    def add(self, message: str, timestamp: Optional[str] = None) -> LogCluster:
+        masked = mask_message(message)
+        cluster = self.cache.get(masked)
+        if cluster is not None:
+            cluster.observe(timestamp)
+            return cluster
+
+        cluster = self._assign(masked.split(), message, timestamp)
+        if len(self.cache) >= MAX_CACHED_MESSAGES:
+            self.cache.clear()
+        self.cache[masked] = cluster
+        cluster.observe(timestamp)
+        return cluster
+
+    def _assign(self, tokens: list[str], message: str, timestamp: Optional[str]) -> LogCluster:
+        leaf = self._leaf(tokens)
+
+        best, best_score = None, -1.0
+        for cluster in leaf:
+            score = self._similarity(cluster.tokens, tokens)
+            if score > best_score:
+                best, best_score = cluster, score
+
+        full = len(leaf) >= self.max_clusters_per_leaf or len(self.clusters) >= self.max_clusters
+
+        if best is not None and (best_score >= self.similarity_threshold or full):
+            if best_score < 1.0:
+                best.tokens = [
+                    a if a == b else WILDCARD for a, b in zip(best.tokens, tokens)
+                ]
+            return best
+
+        if full:
+            # Global cap reached with no sibling to absorb the line
+            return self._overflow(message, timestamp)
+
+        cluster = LogCluster(tokens, message, timestamp)
+        leaf.append(cluster)
+        self.clusters.append(cluster)
+        return cluster
+
+    def _overflow(self, message: str, timestamp: Optional[str]) -> LogCluster:
+        leaf = self.tree.setdefault(None, [])
+        if not leaf:
+            cluster = LogCluster([WILDCARD], message, timestamp)
+            leaf.append(cluster)
+            self.clusters.append(cluster)
+        return leaf[0]
+
+    def signatures(self, top_k: Optional[int] = None) -> list[dict]:
+        ranked = sorted(self.clusters, key=lambda c: (-c.count, c.template))
+        if top_k is not None:
+            ranked = ranked[:top_k]
+        return [c.to_dict() for c in ranked]
@@ -0,0 +1,56 @@
+# benchmarks/classification_benchmark.py
+#
+# Time per classify_root_cause call with the shipped taxonomy, and with the
+# taxonomy padded out with synthetic keywords to check that cost stays flat
+# as the keyword count grows.
+#
+#   python -m benchmarks.classification_benchmark --extra-keywords 1000
+
+import argparse
+import random
+import string
+import timeit
+
+from recommendations.recommendation_engine import TAXONOMY, classify_root_cause
+from recommendations.taxonomy import build_matcher
+
+ROOT_CAUSES = [
+    "The auth-service experienced elevated latency because the database connection pool "
+    "was saturated by long-running queries during a traffic spike",
+    "Frequent full GC pauses caused by a memory leak in the session cache",
+    "Upstream payment API returned 503 errors after a deployment",
+    "Root cause analysis unavailable due to AI service error",
+]
+
+
+def padded_taxonomy(extra: int, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    categories = {name: {"keywords": dict(c["keywords"])} for name, c in TAXONOMY.items()}
+    names = [n for n in categories if n != "unknown"]
+    for _ in range(extra):
+        word = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 12)))
+        categories[rng.choice(names)]["keywords"][word] = rng.randint(1, 5)
+    return categories
+
+
+def per_call_us(fn, number: int) -> float:
+    return timeit.timeit(lambda: [fn(t) for t in ROOT_CAUSES], number=number) / (number * len(ROOT_CAUSES)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--extra-keywords", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=5000)
+    args = parser.parse_args()
+
+    shipped = sum(len(c["keywords"]) for c in TAXONOMY.values())
+    print(f"{shipped:>6} keywords: {per_call_us(classify_root_cause, args.number):6.1f} us/call")
+
+    padded = padded_taxonomy(args.extra_keywords)
+    matcher = build_matcher(padded)
+    total = sum(len(c["keywords"]) for c in padded.values())
+    print(f"{total:>6} keywords: {per_call_us(matcher.classify, args.number):6.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# benchmarks/detection_benchmark.py
+#
+# Per-service cost of detect_incident (one file per call) against the
+# columnar batch path over the same snapshots.
+#
+#   python -m benchmarks.detection_benchmark --services 500
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.workloads import synthetic_snapshots
+from detection.batch_detector import detect_incidents, detect_incidents_batch
+from detection.incident_detector import detect_incident
+
+
+def _timed(fn) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def run(services: int):
+    snapshots = synthetic_snapshots(services)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for snapshot in snapshots:
+            path = os.path.join(tmp, f"{snapshot['service']}.json")
+            with open(path, "w") as f:
+                json.dump(snapshot, f)
+            paths.append(path)
+
+        per_file, a = _timed(lambda: [detect_incident(p) for p in paths])
+        batch_files, b = _timed(lambda: detect_incidents(paths))
+        batch_only, c = _timed(lambda: detect_incidents_batch(snapshots))
+
+    assert [x and x["symptoms"] for x in a] == [x and x["symptoms"] for x in b] == [x and x["symptoms"] for x in c]
+
+    for name, elapsed in [
+        ("detect_incident per file", per_file),
+        ("detect_incidents (load + batch)", batch_files),
+        ("detect_incidents_batch (in memory)", batch_only),
+    ]:
+        print(f"{name:<36} total {elapsed * 1000:8.1f} ms  per service {elapsed / services * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--services", type=int, default=500)
+    run(parser.parse_args().services)
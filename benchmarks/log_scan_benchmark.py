@@ -0,0 +1,67 @@
+# benchmarks/log_scan_benchmark.py
+#
+# Compares CPU per GB of the original analyze_logs(f.readlines()) path with
+# the streaming and mmap scanners on a synthetic log.
+#
+#   python -m benchmarks.log_scan_benchmark --size-mb 256
+
+import argparse
+import os
+import tempfile
+import time
+
+from analysis.log_analysis import analyze_logs, analyze_log_stream
+from analysis.log_scan import analyze_log_mmap, count_log_lines, scan_log_mmap
+from benchmarks.workloads import write_synthetic_log
+
+
+def _readlines(path: str) -> dict:
+    with open(path, "r") as f:
+        return analyze_logs(f.readlines())
+
+
+def _stream(path: str) -> dict:
+    with open(path, "r") as f:
+        return analyze_log_stream(f)
+
+
+def _mmap_scan(path: str) -> dict:
+    # Same work as analyze_logs (raw key errors, no templating), via the
+    # byte-level prefilter
+    key_errors = [str(v, "utf-8", errors="replace").split("ERROR")[1].strip() for v in scan_log_mmap(path)]
+    both = sum(1 for e in key_errors if "WARN" in e)
+    return {"error_count": len(key_errors), "warning_count": count_log_lines(path, "WARN") - both}
+
+
+def _mmap(path: str) -> dict:
+    return analyze_log_mmap(path)
+
+
+def run(size_mb: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.log")
+        write_synthetic_log(path, size_mb)
+        gb = os.path.getsize(path) / 1024 ** 3
+
+        cases = [
+            ("readlines+analyze_logs", _readlines),
+            ("mmap scan, raw errors", _mmap_scan),
+            ("analyze_log_stream", _stream),
+            ("analyze_log_mmap", _mmap),
+        ]
+        for name, fn in cases:
+            wall = time.perf_counter()
+            cpu = time.process_time()
+            result = fn(path)
+            cpu = time.process_time() - cpu
+            wall = time.perf_counter() - wall
+            print(
+                f"{name:<24} wall {wall:7.2f}s  cpu/GB {cpu / gb:7.2f}s  "
+                f"errors {result['error_count']}  warnings {result['warning_count']}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=128)
+    run(parser.parse_args().size_mb)
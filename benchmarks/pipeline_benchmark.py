@@ -0,0 +1,240 @@
+# benchmarks/pipeline_benchmark.py
+#
+# Throughput of each pipeline stage on synthetic workloads: detection, log
+# analysis, report generation and PDF rendering, and the full incident graph
+# with the LLM replaced by the in-process stub at a fixed latency. Results
+# are written as JSON; --compare prints the change against an earlier run.
+#
+#   python -m benchmarks.pipeline_benchmark --log-mb 2048 --llm-latency 0.5
+#   python -m benchmarks.pipeline_benchmark --compare benchmarks/results/<earlier>.json
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from analysis.log_ingestion import LOG_DIR, analyze_log_file
+from benchmarks.workloads import (
+    REALISTIC_MIX,
+    synthetic_incidents,
+    synthetic_snapshots,
+    synthetic_state,
+    write_synthetic_log
+)
+from detection.incident_detector import detect_incident
+from observability.tracing import trace_summary
+from reasoning.backends import BackendChain, StubBackend
+from reasoning.llm_client import set_backends
+from reporting.incident_store import get_store
+from reporting.render_queue import drain_render_queue
+from reporting.report_generator import generate_markdown_report, markdown_to_pdf
+from workflows.incident_graph import build_incident_graph
+from workflows.run_workflow import initial_state
+
+RESULTS_DIR = "benchmarks/results"
+LLM_STUB_LATENCY = float(os.getenv("LLM_STUB_LATENCY", 0.2))
+
+
+def _result(items: int, seconds: float, **extra) -> dict:
+    return {"items": items, "seconds": round(seconds, 4), "per_second": round(items / seconds, 2), **extra}
+
+
+# ----------------------
+# Stages
+# ----------------------
+
+def bench_detect(tmp: str, services: int) -> dict:
+    paths = []
+    for snapshot in synthetic_snapshots(services):
+        path = os.path.join(tmp, f"{snapshot['service']}.json")
+        with open(path, "w") as f:
+            json.dump(snapshot, f)
+        paths.append(path)
+
+    start = time.perf_counter()
+    incidents = [detect_incident(p) for p in paths]
+    elapsed = time.perf_counter() - start
+    return _result(services, elapsed, incidents=sum(1 for i in incidents if i))
+
+
+def bench_logs(tmp: str, size_mb: int) -> dict:
+    path = os.path.join(tmp, "bench.log")
+    write_synthetic_log(path, size_mb, mix=REALISTIC_MIX)
+    mb = os.path.getsize(path) / 1024 ** 2
+
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    analysis = analyze_log_file(path)
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+
+    os.remove(path)
+    return {
+        "megabytes": round(mb, 1),
+        "seconds": round(wall, 4),
+        "mb_per_second": round(mb / wall, 1),
+        "cpu_seconds_per_gb": round(cpu / mb * 1024, 2),
+        "error_count": analysis["error_count"],
+        "warning_count": analysis["warning_count"]
+    }
+
+
+def bench_reports(tmp: str, reports: int) -> dict:
+    rng = random.Random(7)
+    states = [synthetic_state(i, rng) for i in range(reports)]
+
+    start = time.perf_counter()
+    markdown = [generate_markdown_report(s) for s in states]
+    md_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i, md in enumerate(markdown):
+        markdown_to_pdf(md, os.path.join(tmp, f"{i}.pdf"))
+    pdf_seconds = time.perf_counter() - start
+
+    return {
+        "generate_markdown_report": _result(reports, md_seconds),
+        "markdown_to_pdf": _result(reports, pdf_seconds)
+    }
+
+
+def bench_graph(tmp: str, incidents: int, llm_latency: float, service_log_mb: int) -> dict:
+    # Runs in its own directory: the graph writes reports, checkpoints and
+    # the incident store relative to the working directory
+    workload = synthetic_incidents(incidents)
+    cwd = os.getcwd()
+    cache_setting = os.environ.get("LLM_CACHE")
+    os.chdir(tmp)
+    os.environ["LLM_CACHE"] = "0"  # every escalated incident reaches the stub
+
+    try:
+        os.makedirs(LOG_DIR, exist_ok=True)
+        services = dict.fromkeys(incident["service"] for incident in workload)
+        for seed, service in enumerate(services):
+            write_synthetic_log(os.path.join(LOG_DIR, f"{service}.log"), service_log_mb, seed=seed, mix=REALISTIC_MIX)
+
+        set_backends(BackendChain([StubBackend(llm_latency)]))
+        graph = build_incident_graph()
+
+        start = time.perf_counter()
+        states = [graph.invoke(initial_state(incident)) for incident in workload]
+        invoke_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        drain_render_queue()
+        drain_seconds = time.perf_counter() - start
+        get_store().close()
+    finally:
+        os.chdir(cwd)
+        if cache_setting is None:
+            os.environ.pop("LLM_CACHE", None)
+        else:
+            os.environ["LLM_CACHE"] = cache_setting
+
+    # Per-node means from the spans each run carries
+    nodes = {}
+    for state in states:
+        for span in state["trace"]:
+            nodes.setdefault(span["node"], []).append(span["wall_ms"])
+    summaries = [trace_summary(s["trace"]) for s in states]
+
+    return {
+        **_result(incidents, invoke_seconds),
+        "incidents_per_minute": round(incidents / invoke_seconds * 60, 1),
+        "llm_latency": llm_latency,
+        "llm_calls": sum(s["llm_calls"] for s in summaries),
+        "rules_answered": sum(1 for s in states if s["root_cause_source"] == "rules"),
+        "pdf_drain_seconds": round(drain_seconds, 4),
+        "node_mean_ms": {name: round(sum(ms) / len(ms), 2) for name, ms in nodes.items()}
+    }
+
+
+# ----------------------
+# Results
+# ----------------------
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+# Higher is better for every metric compared
+COMPARED = {
+    "detect_incident": "per_second",
+    "analyze_logs": "mb_per_second",
+    "generate_markdown_report": "per_second",
+    "markdown_to_pdf": "per_second",
+    "graph_invoke": "per_second"
+}
+
+
+def compare(results: dict, baseline: dict):
+    print(f"\nAgainst {baseline.get('commit') or 'baseline'} ({baseline['timestamp']}):")
+    changed = [k for k, v in results["params"].items() if baseline.get("params", {}).get(k) != v]
+    if changed:
+        print(f"  (parameters differ: {', '.join(changed)})")
+    for stage, metric in COMPARED.items():
+        old = baseline["stages"].get(stage, {}).get(metric)
+        new = results["stages"].get(stage, {}).get(metric)
+        if not old or new is None:
+            continue
+        print(f"  {stage:<26} {metric:<14} {old:>10} -> {new:>10}  ({(new - old) / old:+.1%})")
+
+
+def run(args) -> dict:
+    stages = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        stages["detect_incident"] = bench_detect(tmp, args.services)
+        stages["analyze_logs"] = bench_logs(tmp, args.log_mb)
+        stages.update(bench_reports(tmp, args.reports))
+        stages["graph_invoke"] = bench_graph(tmp, args.incidents, args.llm_latency, args.service_log_mb)
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "params": vars(args) | {"compare": None, "output": None},
+        "stages": stages
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--services", type=int, default=500, help="Snapshots for detect_incident")
+    parser.add_argument("--log-mb", type=int, default=256, help="Size of the synthetic log for analysis")
+    parser.add_argument("--reports", type=int, default=100)
+    parser.add_argument("--incidents", type=int, default=50, help="Incidents through graph.invoke")
+    parser.add_argument("--service-log-mb", type=int, default=1, help="Log per service in the graph run")
+    parser.add_argument("--llm-latency", type=float, default=LLM_STUB_LATENCY, help="Stub LLM seconds per call")
+    parser.add_argument("--output", help=f"Results file (default: {RESULTS_DIR}/<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    results = run(args)
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ") + ".json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print(json.dumps(results["stages"], indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
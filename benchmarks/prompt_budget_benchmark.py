@@ -0,0 +1,64 @@
+# benchmarks/prompt_budget_benchmark.py
+#
+# Shows that the root-cause prompt stays within the token budget however many
+# error lines the log analysis carries, and how many tokens compaction saves
+# over embedding the raw analysis dicts.
+#
+#   python -m benchmarks.prompt_budget_benchmark --errors 100000
+
+import argparse
+import random
+import time
+
+from analysis.log_analysis import analyze_logs
+from reasoning.prompt_builder import DEFAULT_TOKEN_BUDGET, compact_facts, estimate_tokens
+from reasoning.root_cause_ai import build_root_cause_prompt
+
+ERROR_TEMPLATES = [
+    "DB timeout after {n}ms on conn {m}",
+    "upstream 10.0.{m}.4:8080 refused request",
+    "Connection pool exhausted (active={n})",
+    "Failed to refresh token for user user{n}",
+]
+
+METRICS_ANALYSIS = {
+    "cpu_status": "HIGH",
+    "error_rate_status": "CRITICAL",
+    "latency_status": "MEDIUM",
+    "summary": "CPU: HIGH, Errors: CRITICAL, Latency: MEDIUM"
+}
+
+
+def synthetic_error_lines(count: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        "2026-01-17T11:45:00Z ERROR "
+        + rng.choice(ERROR_TEMPLATES).format(n=rng.randint(1, 5000), m=rng.randint(1, 64))
+        for _ in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--errors", type=int, default=100_000)
+    parser.add_argument("--budget", type=int, default=DEFAULT_TOKEN_BUDGET)
+    args = parser.parse_args()
+
+    for count in (10, 1_000, args.errors):
+        log_analysis = analyze_logs(synthetic_error_lines(count))
+
+        start = time.perf_counter()
+        _, stats = compact_facts(METRICS_ANALYSIS, log_analysis, args.budget)
+        prompt = build_root_cause_prompt(METRICS_ANALYSIS, log_analysis)
+        elapsed = time.perf_counter() - start
+
+        assert stats["tokens"] <= args.budget, stats
+        print(
+            f"{count:>8} errors: facts {stats['tokens']:>4} tokens "
+            f"(raw {stats['raw_tokens']:>8}, saved {stats['tokens_saved']:>8}), "
+            f"prompt {estimate_tokens(prompt):>4} tokens, built in {elapsed * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# benchmarks/report_render_benchmark.py
+#
+# Reports/sec for bulk PDF regeneration: a fresh renderer per report (what
+# markdown_to_pdf did before styles and parsed lines were kept) against one
+# shared ReportRenderer.
+#
+#   python -m benchmarks.report_render_benchmark --reports 200
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.workloads import synthetic_state
+from reporting.report_generator import ReportRenderer, generate_markdown_report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reports", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    reports = [generate_markdown_report(synthetic_state(i, rng)) for i in range(args.reports)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, f"{i}.pdf") for i in range(args.reports)]
+
+        start = time.perf_counter()
+        for md, path in zip(reports, paths):
+            ReportRenderer().render(md, path)
+        fresh = time.perf_counter() - start
+
+        renderer = ReportRenderer()
+        start = time.perf_counter()
+        renderer.render_many(zip(reports, paths))
+        shared = time.perf_counter() - start
+
+    print(f"fresh renderer per report: {args.reports / fresh:7.1f} reports/s")
+    print(f"shared ReportRenderer:     {args.reports / shared:7.1f} reports/s ({fresh / shared:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# benchmarks/workloads.py
+#
+# Synthetic inputs shared by the benchmarks: metric snapshots, incidents
+# detected from them, service logs, and finished incident states for report
+# rendering. Everything is seeded, so a run is reproducible.
+
+import json
+import random
+from typing import Optional
+
+from detection.batch_detector import detect_incidents_batch
+from detection.incident_detector import SEVERITY_SCORE
+
+TEMPLATE_SNAPSHOT_PATH = "data/metrics/service_metrics.json"
+
+SEVERITIES = list(SEVERITY_SCORE)
+
+# ----------------------
+# Metric Snapshots
+# ----------------------
+
+def synthetic_snapshots(
+    services: int,
+    seed: int = 7,
+    severity_weights: Optional[dict[str, float]] = None
+) -> list[dict]:
+    # Every metric of the template snapshot, values jittered by +/-50% and
+    # severities drawn from severity_weights (uniform by default)
+    rng = random.Random(seed)
+    with open(TEMPLATE_SNAPSHOT_PATH, "r") as f:
+        template = json.load(f)
+
+    labels = list(severity_weights) if severity_weights else SEVERITIES
+    weights = list(severity_weights.values()) if severity_weights else None
+
+    snapshots = []
+    for i in range(services):
+        snapshot = {"timestamp": template["timestamp"], "service": f"service-{i:04d}"}
+        for group, metrics in template.items():
+            if not isinstance(metrics, dict):
+                continue
+            snapshot[group] = {
+                name: {"value": round(m["value"] * rng.uniform(0.5, 1.5), 2), "severity": rng.choices(labels, weights)[0]}
+                for name, m in metrics.items()
+            }
+        snapshots.append(snapshot)
+    return snapshots
+
+
+def synthetic_incidents(count: int, seed: int = 7) -> list[dict]:
+    # Incidents as the detector would raise them, from snapshots that lean
+    # towards HIGH so most services qualify
+    weights = {"LOW": 0.35, "MEDIUM": 0.25, "HIGH": 0.3, "CRITICAL": 0.1}
+    incidents = []
+    batch = 0
+    while len(incidents) < count:
+        snapshots = synthetic_snapshots(count, seed=seed + batch, severity_weights=weights)
+        incidents.extend(i for i in detect_incidents_batch(snapshots) if i is not None)
+        batch += 1
+    return incidents[:count]
+
+
+# ----------------------
+# Logs
+# ----------------------
+# Mostly request noise with a few percent warnings and errors spread over the
+# failure modes the rules and taxonomy know about, so every analysis stage
+# has templates to cluster.
+
+LINE_TEMPLATES = [
+    (0.95, "INFO request served path=/login status=200 duration_ms={n}"),
+    (0.035, "WARN connection pool usage at {n}%"),
+    (0.01, "ERROR DB timeout after {n}ms on conn {m}"),
+    (0.005, "ERROR upstream 10.0.{m}.4:8080 refused request"),
+]
+
+REALISTIC_MIX = [
+    (0.900, "INFO request served path=/api/v1/orders/{n} status=200 duration_ms={m}"),
+    (0.030, "INFO cache refresh completed keys={n} duration_ms={m}"),
+    (0.030, "WARN connection pool usage at {m}%"),
+    (0.010, "WARN GC pause {n}ms exceeded threshold"),
+    (0.010, "ERROR DB timeout after {n}ms on conn {m}"),
+    (0.005, "ERROR Connection pool exhausted (active={m}, waiting={n})"),
+    (0.005, "ERROR upstream 10.0.{m}.4:8080 refused request"),
+    (0.004, "ERROR HTTP 503 from payment-gateway after {n}ms"),
+    (0.003, "ERROR java.lang.OutOfMemoryError: Java heap space in worker-{m}"),
+    (0.002, "ERROR TLS handshake failed with 10.0.{m}.9: certificate expired"),
+    (0.001, "ERROR Failed to refresh token for user user{n}"),
+]
+
+UNIQUE_CHUNKS = 64  # ~10k lines each; larger files cycle through them
+
+
+def write_synthetic_log(path: str, size_mb: int, seed: int = 7, mix: list[tuple[float, str]] = LINE_TEMPLATES):
+    # Multi-GB files would spend most of their time in random(), so after
+    # UNIQUE_CHUNKS chunks the same chunks are written again in turn; the
+    # line mix is unchanged
+    rng = random.Random(seed)
+    weights = [w for w, _ in mix]
+    templates = [t for _, t in mix]
+    target = size_mb * 1024 * 1024
+    written = 0
+    written_chunks = 0
+    chunks = []
+
+    with open(path, "w") as f:
+        while written < target:
+            if len(chunks) < UNIQUE_CHUNKS:
+                batch = []
+                for template in rng.choices(templates, weights, k=10_000):
+                    body = template.format(n=rng.randint(1, 5000), m=rng.randint(1, 64))
+                    batch.append(f"2026-01-17T11:45:{rng.randint(0, 59):02d}Z {body}\n")
+                chunks.append("".join(batch))
+                chunk = chunks[-1]
+            else:
+                chunk = chunks[written_chunks % UNIQUE_CHUNKS]
+            f.write(chunk)
+            written += len(chunk)
+            written_chunks += 1
+
+
+# ----------------------
+# Incident States
+# ----------------------
+
+SERVICES = ["auth-service", "payment-service", "search-service", "cart-service"]
+ERRORS = [
+    "DB timeout after {NUM}ms on conn {NUM}",
+    "Connection pool exhausted (active={NUM})",
+    "upstream {IP} refused request",
+    "Failed to refresh token for user {*}",
+]
+ACTIONS = [
+    ("Check database connection pool saturation", "INVESTIGATE", 0.9),
+    ("Verify database network connectivity", "INVESTIGATE", 0.85),
+    ("Scale database read replicas", "MITIGATE", 0.7),
+]
+
+
+def synthetic_state(i: int, rng: random.Random) -> dict:
+    # A finished graph state, as report_node receives it
+    severity = rng.choice(["CRITICAL", "HIGH", "MEDIUM"])
+    return {
+        "incident": {
+            "incident_id": f"INC-{i:06d}",
+            "service": rng.choice(SERVICES),
+            "severity": severity,
+            "detected_at": f"2026-01-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00Z",
+            "symptoms": ["Database Connection Pool Usage Percent is HIGH", "Latency Latency Ms P95 is HIGH"]
+        },
+        "metrics_analysis": {
+            "cpu_status": rng.choice(["CRITICAL", "HIGH", "MEDIUM"]),
+            "error_rate_status": severity,
+            "latency_status": "HIGH",
+            "summary": f"CPU: HIGH, Errors: {severity}, Latency: HIGH"
+        },
+        "log_analysis": {
+            "error_count": rng.randint(10, 5000),
+            "warning_count": rng.randint(0, 500),
+            "error_signatures": [
+                {"template": t, "count": rng.randint(1, 1000), "first_seen": None, "last_seen": None}
+                for t in rng.sample(ERRORS, 3)
+            ]
+        },
+        "root_cause": "Database connection pool saturation is causing query timeouts and failed requests.",
+        "root_cause_source": "rules",
+        "root_cause_confidence": 0.91,
+        "recommendations": [
+            {"action": a, "type": t, "confidence": c, "explanation": "Pool usage and query timeouts are elevated."}
+            for a, t, c in ACTIONS
+        ]
+    }
@@ -1,9 +1,17 @@
 import json
+import sys
 import streamlit as st
 from pathlib import Path
 import pandas as pd
 import altair as alt
 from datetime import timedelta
+from typing import Optional
+
+# streamlit runs this file as a script; make the project packages importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from observability.tracing import trace_summary
+from reporting.incident_store import PDF_FAILED, PDF_PENDING, get_store
 
 # ----------------------
 # Page Config
@@ -64,21 +72,72 @@ body {
 # ----------------------
 # Load Data
 # ----------------------
+# Streamlit reruns this script on every interaction. Everything read from
+# disk is cached and keyed by file mtimes, so a rerun only touches disk after
+# a workflow has written something; charts come from the per-day rollups the
+# incident store maintains, and the table fetches one page of filtered rows
+# at a time with every filter applied in SQL.
 latest_path = Path("dashboard/latest_incident.json")
-index_path = Path("reports/index.json")
+store = get_store()
+
+INCIDENT_COLUMNS = ["incident_id", "service", "severity", "detected_at", "md_path", "pdf_path", "pdf_status", "pdf_error"]
+
+
+@st.cache_data
+def load_latest(mtime_ns: int) -> dict:
+    with open(latest_path) as f:
+        return json.load(f)
+
+
+@st.cache_data
+def load_rollups(stamp: tuple, severity: Optional[tuple] = None, since_day: Optional[str] = None) -> pd.DataFrame:
+    # Per-day counts by severity, summed over services in SQL
+    rollups = pd.DataFrame(store.daily_rollups(severity, since_day), columns=["day", "severity", "count"])
+    rollups["day"] = pd.to_datetime(rollups["day"])
+    return rollups
+
+
+PAGE_SIZE = 50
+
+
+@st.cache_data
+def load_page(stamp: tuple, filters: tuple, after: Optional[tuple]) -> tuple[pd.DataFrame, Optional[tuple]]:
+    rows, next_cursor = store.page(PAGE_SIZE, after=after, **dict(filters))
+    incidents = pd.DataFrame(rows, columns=INCIDENT_COLUMNS)
+    incidents["detected_at"] = pd.to_datetime(incidents["detected_at"])
+    return incidents, next_cursor
 
-if not latest_path.exists() or not index_path.exists():
-    st.error("Run workflow at least once to generate reports.")
-    st.stop()
 
-with open(latest_path) as f:
-    latest = json.load(f)
+@st.cache_data
+def count_matching(stamp: tuple, filters: tuple) -> int:
+    return store.count(**dict(filters))
 
-with open(index_path) as f:
-    index = json.load(f)
 
-df = pd.DataFrame(index)
-df["detected_at"] = pd.to_datetime(df["detected_at"])
+@st.cache_data
+def load_daily_counts(stamp: tuple, filters: tuple) -> pd.DataFrame:
+    counts = pd.DataFrame(store.daily_counts(**dict(filters)), columns=["day", "severity", "count"])
+    counts["day"] = pd.to_datetime(counts["day"])
+    return counts
+
+
+def normalize_id_prefix(text: str) -> Optional[str]:
+    # "d57f" -> "INC-D57F"; ids are "INC-" plus upper-case hex
+    text = text.strip().upper()
+    if not text:
+        return None
+    if not text.startswith("INC-") and not "INC-".startswith(text):
+        text = "INC-" + text
+    return text
+
+
+stamp = store.data_stamp()
+rollups = load_rollups(stamp)
+
+if not latest_path.exists() or rollups.empty:
+    st.error("Run workflow at least once to generate reports.")
+    st.stop()
+
+latest = load_latest(latest_path.stat().st_mtime_ns)
 
 incident = latest["incident"]
 snapshot = incident["metrics_snapshot"]
@@ -160,6 +219,56 @@ st.markdown(f"""
 </div>
 """, unsafe_allow_html=True)
 
+# ----------------------
+# PIPELINE LATENCY (LATEST INCIDENT)
+# ----------------------
+# One span per graph node; metrics and log analysis run side by side, so the
+# total is end-to-end time rather than the sum of the bars
+st.markdown('<div class="h2">Pipeline Latency</div>', unsafe_allow_html=True)
+
+trace = latest.get("trace") or []
+
+if trace:
+    summary = trace_summary(trace)
+    st.markdown(f"""
+<div class="text-muted">
+    End to end: {summary['wall_ms']:.0f} ms |
+    CPU: {summary['cpu_ms']:.0f} ms |
+    Log bytes read: {summary['bytes_read']:,} |
+    LLM calls: {summary['llm_calls']} ({summary['llm_cache_hits']} cached) |
+    Tokens: {summary['llm_input_tokens']} in / {summary['llm_output_tokens']} out
+</div>
+""", unsafe_allow_html=True)
+
+    spans = pd.DataFrame(trace)
+    timing_df = spans.melt(
+        id_vars=["node"],
+        value_vars=["wall_ms", "cpu_ms"],
+        var_name="time",
+        value_name="ms"
+    ).replace({"time": {"wall_ms": "Wall", "cpu_ms": "CPU"}})
+
+    latency_bar = (
+        alt.Chart(timing_df)
+        .mark_bar()
+        .encode(
+            y=alt.Y("node:N", title="", sort=spans["node"].tolist()),
+            x=alt.X("ms:Q", title="Milliseconds"),
+            yOffset="time:N",
+            color=alt.Color(
+                "time:N",
+                title="",
+                scale=alt.Scale(domain=["Wall", "CPU"], range=["#58a6ff", "#d29922"])
+            ),
+            tooltip=["node", "time", "ms"]
+        )
+        .properties(height=250)
+    )
+
+    st.altair_chart(latency_bar, width="stretch")
+else:
+    st.info("No trace recorded for this incident.")
+
 # ============================================================
 # INCIDENT HISTORY WITH FILTERS
 # ============================================================
@@ -168,43 +277,47 @@ st.markdown('<div class="h2">Incident History</div>', unsafe_allow_html=True)
 f1, f2, f3 = st.columns(3)
 
 with f1:
-    search_id = st.text_input("Search Incident ID")
+    search_id = st.text_input("Search Incident ID (prefix)")
 
 with f2:
     period = st.selectbox("Date Filter", ["All", "Today", "This Week", "This Month"])
 
 with f3:
+    severities = sorted(rollups["severity"].unique().tolist())
     severity_filter = st.multiselect(
         "Severity",
-        options=df["severity"].unique().tolist(),
-        default=df["severity"].unique().tolist()
+        options=severities,
+        default=severities
     )
 
-filtered = df.copy()
-
-if search_id:
-    filtered = filtered[filtered["incident_id"].str.contains(search_id, case=False)]
-
-filtered = filtered[filtered["severity"].isin(severity_filter)]
-
 now = pd.Timestamp.utcnow()
 
+# Lower bound on detected_at (ISO text compares chronologically), a whole
+# day so the per-day rollups count exactly the rows the table shows
+since = None
 if period == "Today":
-    filtered = filtered[filtered["detected_at"].dt.date == now.date()]
+    since = now.strftime("%Y-%m-%d")
 elif period == "This Week":
-    filtered = filtered[filtered["detected_at"] >= now - timedelta(days=7)]
+    since = (now - timedelta(days=7)).strftime("%Y-%m-%d")
 elif period == "This Month":
-    filtered = filtered[filtered["detected_at"] >= now - timedelta(days=30)]
+    since = (now - timedelta(days=30)).strftime("%Y-%m-%d")
+
+id_prefix = normalize_id_prefix(search_id)
+filters = (("severity", tuple(severity_filter)), ("since", since), ("id_prefix", id_prefix))
+
+# Chart counts: from the rollups unless an ID search narrows the rows
+if id_prefix:
+    counts = load_daily_counts(stamp, filters)
+else:
+    counts = load_rollups(stamp, tuple(severity_filter), since)
 
 # ----------------------
 # INCIDENT VOLUME BAR CHART
 # ----------------------
 st.markdown('<div class="h2">Incident Volume</div>', unsafe_allow_html=True)
 
-if not filtered.empty:
-    volume_df = filtered.copy()
-    volume_df["date"] = volume_df["detected_at"].dt.date
-    count_df = volume_df.groupby("date").size().reset_index(name="count")
+if not counts.empty:
+    count_df = counts.groupby("day")["count"].sum().reset_index().rename(columns={"day": "date"})
 
     volume_bar = (
         alt.Chart(count_df)
@@ -226,8 +339,8 @@ else:
 # ----------------------
 st.markdown('<div class="h2">Severity Distribution</div>', unsafe_allow_html=True)
 
-if not filtered.empty:
-    sev_df = filtered.groupby("severity").size().reset_index(name="count")
+if not counts.empty:
+    sev_df = counts.groupby("severity")["count"].sum().reset_index()
 
     severity_pie = (
         alt.Chart(sev_df)
@@ -255,23 +368,54 @@ else:
 # ----------------------
 st.markdown('<div class="h2">Incident Table</div>', unsafe_allow_html=True)
 
+# Keyset paging: the cursor for each page visited so far, reset whenever the
+# filters change
+if st.session_state.get("page_filters") != filters:
+    st.session_state["page_filters"] = filters
+    st.session_state["page_cursors"] = [None]
+
+cursors = st.session_state["page_cursors"]
+page_index = len(cursors) - 1
+filtered, next_cursor = load_page(stamp, filters, cursors[-1])
+
 if filtered.empty:
     st.info("No incidents match the selected filters.")
     st.stop()
 
+# Without an ID search the chart counts already cover exactly these rows
+total = count_matching(stamp, filters) if id_prefix else int(counts["count"].sum())
+pages = max(1, -(-total // PAGE_SIZE))
+
 st.dataframe(
-    filtered.sort_values("detected_at", ascending=False)[
-        ["incident_id", "service", "severity", "detected_at"]
-    ],
+    filtered[["incident_id", "service", "severity", "detected_at"]],
     width="stretch",
     hide_index=True
 )
 
+p1, p2, p3 = st.columns([1, 2, 1])
+
+with p1:
+    if st.button("Previous", disabled=page_index == 0):
+        cursors.pop()
+        st.rerun()
+
+with p2:
+    st.markdown(
+        f'<div class="text-muted">Page {page_index + 1} of {pages} ({total} incidents)</div>',
+        unsafe_allow_html=True
+    )
+
+with p3:
+    if st.button("Next", disabled=next_cursor is None):
+        cursors.append(next_cursor)
+        st.rerun()
+
 # ----------------------
 # REPORT DOWNLOAD (SAFE)
 # ----------------------
 st.markdown('<div class="h2">Download Report</div>', unsafe_allow_html=True)
 
+# Only the incidents on the current page are offered
 selected = st.selectbox(
     "Select Incident",
     filtered["incident_id"].tolist()
@@ -285,10 +429,20 @@ if selected_rows.empty:
 
 row = selected_rows.iloc[0]
 
-with open(row["pdf_path"], "rb") as f:
-    st.download_button(
-        "Download PDF",
-        data=f,
-        file_name=Path(row["pdf_path"]).name,
-        mime="application/pdf"
-    )
+# PDFs are rendered in the background; older entries have no status
+pdf_status = row.get("pdf_status")
+
+if pdf_status == PDF_PENDING:
+    st.info("PDF is still being rendered. Refresh in a moment.")
+elif pdf_status == PDF_FAILED:
+    st.error(f"PDF rendering failed: {row.get('pdf_error')}")
+elif not row["pdf_path"] or not Path(row["pdf_path"]).exists():
+    st.warning("PDF file not found.")
+else:
+    with open(row["pdf_path"], "rb") as f:
+        st.download_button(
+            "Download PDF",
+            data=f,
+            file_name=Path(row["pdf_path"]).name,
+            mime="application/pdf"
+        )
@@ -0,0 +1,223 @@
+# detection/anomaly_engine.py
+
+import json
+import math
+from bisect import bisect_left, insort
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from utils.files import file_lock, write_json_atomic
+
+ANOMALY_STATE_PATH = "data/checkpoints/anomaly_state.json"
+
+# ----------------------
+# Engine Defaults
+# ----------------------
+
+EWMA_ALPHA = 0.1
+MEDIAN_WINDOW = 31
+MIN_SAMPLES = 10             # below this a metric keeps its provided label
+SEASONAL_MIN_SAMPLES = 5     # per hour-of-day bucket
+MAD_TO_SIGMA = 1.4826
+
+# Smallest spread a z-score divides by, in the metric's own unit: a steady
+# metric measures a spread of ~0, and without a floor the first tiny move
+# reads as a huge anomaly. Looked up by metric name, then by unit token, as
+# (absolute minimum, fraction of the typical value). The fraction only
+# applies to a history that has not moved at all (a count that sat at 0, a
+# constant gauge), where there is no measured spread to go on; percentages
+# have a fixed scale and rely on the absolute minimum alone.
+SPREAD_FLOORS = {
+    "service_uptime_percent": (0.01, 0.0),
+    "error_rate_percent": (0.1, 0.0),
+    "query_timeout_rate_percent": (0.1, 0.0),
+}
+UNIT_SPREAD_FLOORS = {
+    "percent": (1.0, 0.0),      # percentage points
+    "ms": (5.0, 0.05),
+    "count": (1.0, 0.05),       # one event
+    "per_min": (1.0, 0.05),
+    "depth": (1.0, 0.05),
+}
+DEFAULT_SPREAD_FLOOR = (1.0, 0.05)
+
+# Highest label whose threshold the anomaly z-score reaches
+Z_THRESHOLDS = [
+    ("CRITICAL", 6.0),
+    ("HIGH", 4.0),
+    ("MEDIUM", 2.5),
+]
+
+# Metrics where a drop, not a rise, is the problem
+LOWER_IS_WORSE = {
+    "cache_hit_ratio_percent",
+    "service_uptime_percent",
+}
+
+
+def _hour_bucket(timestamp: Optional[str]) -> Optional[str]:
+    if not timestamp:
+        return None
+    try:
+        return str(datetime.fromisoformat(timestamp.replace("Z", "+00:00")).hour)
+    except ValueError:
+        return None
+
+
+def spread_floor(metric: str) -> tuple[float, float]:
+    name = metric.rsplit(".", 1)[-1]
+    if name in SPREAD_FLOORS:
+        return SPREAD_FLOORS[name]
+    for unit, floor in UNIT_SPREAD_FLOORS.items():
+        if f"_{unit}_" in f"_{name}_":
+            return floor
+    return DEFAULT_SPREAD_FLOOR
+
+
+def _ewma(state: list, x: float, alpha: float):
+    # state = [n, mean, var]; exponentially weighted mean and variance
+    n, mean, var = state
+    if n == 0:
+        state[:] = [1, x, 0.0]
+        return
+    diff = x - mean
+    incr = alpha * diff
+    state[:] = [n + 1, mean + incr, (1 - alpha) * (var + diff * incr)]
+
+
+class MetricBaseline:
+    # Compact per-metric state: EWMA mean/variance overall and per hour of
+    # day (the expected value), plus a fixed-size sorted window of residuals
+    # against that expectation for a rolling median/MAD. Every update is
+    # constant work for a fixed window size.
+
+    __slots__ = ("ewma", "window", "ordered", "seasonal", "window_size")
+
+    def __init__(self, window_size: int = MEDIAN_WINDOW):
+        self.ewma = [0, 0.0, 0.0]
+        self.window = deque()
+        self.ordered: list[float] = []
+        self.seasonal: dict[str, list] = {}
+        self.window_size = window_size
+
+    @property
+    def count(self) -> int:
+        return self.ewma[0]
+
+    def expected(self, bucket: Optional[str]) -> float:
+        seasonal = self.seasonal.get(bucket) if bucket is not None else None
+        if seasonal is not None and seasonal[0] >= SEASONAL_MIN_SAMPLES:
+            return seasonal[1]
+        return self.ewma[1]
+
+    def robust(self) -> tuple[float, float]:
+        ordered = self.ordered
+        mid = len(ordered) // 2
+        median = ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+        deviations = sorted(abs(x - median) for x in ordered)
+        mad = deviations[mid] if len(deviations) % 2 else (deviations[mid - 1] + deviations[mid]) / 2
+        return median, mad * MAD_TO_SIGMA
+
+    def zscore(self, x: float, bucket: Optional[str], floor: tuple[float, float] = DEFAULT_SPREAD_FLOOR) -> float:
+        # Robust z-score of the residual against the seasonal (or overall)
+        # expectation, so a daily peak is not mistaken for an anomaly
+        median, sigma = self.robust()
+        # A flat residual history falls back to the EWMA spread, then to the
+        # metric's floor
+        minimum, flat_fraction = floor
+        sigma = max(sigma, math.sqrt(self.ewma[2]) * 0.1)
+        if sigma == 0:
+            sigma = flat_fraction * abs(self.ewma[1])
+        return (x - self.expected(bucket) - median) / max(sigma, minimum)
+
+    def update(self, x: float, bucket: Optional[str], alpha: float):
+        residual = x - self.expected(bucket)
+
+        _ewma(self.ewma, x, alpha)
+        if bucket is not None:
+            _ewma(self.seasonal.setdefault(bucket, [0, 0.0, 0.0]), x, alpha)
+
+        self.window.append(residual)
+        insort(self.ordered, residual)
+        if len(self.window) > self.window_size:
+            old = self.window.popleft()
+            del self.ordered[bisect_left(self.ordered, old)]
+
+    def to_dict(self) -> dict:
+        return {"ewma": self.ewma, "window": list(self.window), "seasonal": self.seasonal}
+
+    @classmethod
+    def from_dict(cls, data: dict, window_size: int = MEDIAN_WINDOW) -> "MetricBaseline":
+        baseline = cls(window_size)
+        baseline.ewma = list(data["ewma"])
+        baseline.window = deque(data["window"][-window_size:])
+        baseline.ordered = sorted(baseline.window)
+        baseline.seasonal = {k: list(v) for k, v in data["seasonal"].items()}
+        return baseline
+
+
+class AnomalyEngine:
+
+    def __init__(self, alpha: float = EWMA_ALPHA, window_size: int = MEDIAN_WINDOW, min_samples: int = MIN_SAMPLES):
+        self.alpha = alpha
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self.baselines: dict[str, MetricBaseline] = {}
+
+    def severity(self, service: str, metric: str, value: float, timestamp: Optional[str] = None) -> Optional[str]:
+        # Scores the value against the history so far, then folds it in.
+        # Returns None while the metric is still warming up.
+        key = f"{service}/{metric}"
+        baseline = self.baselines.get(key)
+        if baseline is None:
+            baseline = self.baselines[key] = MetricBaseline(self.window_size)
+
+        value = float(value)
+        bucket = _hour_bucket(timestamp)
+        label = None
+
+        if baseline.count >= self.min_samples:
+            z = baseline.zscore(value, bucket, spread_floor(metric))
+            if metric.rsplit(".", 1)[-1] in LOWER_IS_WORSE:
+                z = -z
+            label = "LOW"
+            for name, threshold in Z_THRESHOLDS:
+                if z >= threshold:
+                    label = name
+                    break
+
+        baseline.update(value, bucket, self.alpha)
+        return label
+
+    # ----------------------
+    # Persistence
+    # ----------------------
+
+    def to_dict(self) -> dict:
+        return {
+            "alpha": self.alpha,
+            "window_size": self.window_size,
+            "min_samples": self.min_samples,
+            "baselines": {k: b.to_dict() for k, b in self.baselines.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AnomalyEngine":
+        engine = cls(data["alpha"], data["window_size"], data["min_samples"])
+        engine.baselines = {
+            k: MetricBaseline.from_dict(v, engine.window_size) for k, v in data["baselines"].items()
+        }
+        return engine
+
+    @classmethod
+    def load(cls, path: str = ANOMALY_STATE_PATH) -> "AnomalyEngine":
+        if not Path(path).exists():
+            return cls()
+        with open(path, "r") as f:
+            return cls.from_dict(json.load(f))
+
+    def save(self, path: str = ANOMALY_STATE_PATH):
+        with file_lock(path):
+            write_json_atomic(path, self.to_dict())
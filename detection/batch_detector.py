@@ -0,0 +1,98 @@
+# detection/batch_detector.py
+
+import json
+from typing import Iterable, Optional
+
+import numpy as np
+
+from detection.incident_detector import (
+    ACTIONABLE_SCORE,
+    SEVERITY_LABEL,
+    SEVERITY_SCORE,
+    build_incident,
+    symptom_name
+)
+
+
+# ----------------------
+# Columnar Flattening
+# ----------------------
+
+def flatten_snapshots(snapshots: list[dict]) -> dict:
+    # One pass over the nested dicts; everything after this works on columns.
+    # Rows are emitted in snapshot order, so each snapshot's rows are contiguous.
+    owners, metrics, values, scores = [], [], [], []
+
+    def walk(i, obj, prefix=""):
+        for k, v in obj.items():
+            if isinstance(v, dict) and "severity" in v and "value" in v:
+                owners.append(i)
+                metrics.append(prefix + k)
+                values.append(v["value"])
+                scores.append(SEVERITY_SCORE[v["severity"]])
+            elif isinstance(v, dict):
+                walk(i, v, prefix=f"{prefix}{k}.")
+
+    for i, snapshot in enumerate(snapshots):
+        walk(i, snapshot)
+
+    return {
+        "snapshot": np.asarray(owners, dtype=np.int64),
+        "metric": np.asarray(metrics, dtype=object),
+        "value": np.asarray(values, dtype=np.float64),
+        "score": np.asarray(scores, dtype=np.int8),
+    }
+
+
+def max_severity_scores(columns: dict, count: int) -> np.ndarray:
+    # Max score per snapshot, -1 for snapshots without any metrics
+    result = np.full(count, -1, dtype=np.int8)
+    owners = columns["snapshot"]
+    if owners.size == 0:
+        return result
+
+    starts = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]])
+    result[owners[starts]] = np.maximum.reduceat(columns["score"], starts)
+    return result
+
+
+# ----------------------
+# Batch Detection
+# ----------------------
+
+def detect_incidents_batch(snapshots: list[dict]) -> list[Optional[dict]]:
+    # Same decision and incident shape as detect_incident, for many snapshots
+    # at once; entries are None where nothing is actionable.
+    columns = flatten_snapshots(snapshots)
+    max_scores = max_severity_scores(columns, len(snapshots))
+
+    symptom_rows = np.flatnonzero(columns["score"] >= ACTIONABLE_SCORE)
+    symptom_owners = columns["snapshot"][symptom_rows]
+    bounds = np.searchsorted(symptom_owners, np.arange(len(snapshots) + 1))
+
+    # Symptom text depends only on (metric path, severity), so each distinct
+    # pair is formatted once per batch
+    labels: dict[tuple[str, int], str] = {}
+    symptoms = []
+    for metric, score in zip(columns["metric"][symptom_rows].tolist(), columns["score"][symptom_rows].tolist()):
+        label = labels.get((metric, score))
+        if label is None:
+            label = labels[(metric, score)] = f"{symptom_name(metric)} is {SEVERITY_LABEL[score]}"
+        symptoms.append(label)
+
+    incidents: list[Optional[dict]] = [None] * len(snapshots)
+    for i in np.flatnonzero(max_scores >= ACTIONABLE_SCORE).tolist():
+        incidents[i] = build_incident(
+            snapshots[i],
+            SEVERITY_LABEL[int(max_scores[i])],
+            symptoms[bounds[i]:bounds[i + 1]]
+        )
+    return incidents
+
+
+def detect_incidents(metrics_paths: Iterable[str]) -> list[Optional[dict]]:
+    snapshots = []
+    for path in metrics_paths:
+        with open(path, "r") as f:
+            snapshots.append(json.load(f))
+    return detect_incidents_batch(snapshots)
@@ -0,0 +1,385 @@
+# detection/detector_daemon.py
+#
+# Long-running detector over a stream of metric samples.
+#
+#   python -m detection.detector_daemon --jsonl data/metrics/stream.jsonl
+#   python -m detection.detector_daemon --listen 127.0.0.1:9009 --run-workflow
+#
+# Each input line is either a single sample
+#   {"service": "auth-service", "metric": "database.connection_pool_usage_percent",
+#    "value": 86, "severity": "HIGH", "timestamp": "..."}
+# or a whole snapshot in the service_metrics.json format.
+
+import argparse
+import json
+import math
+import os
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+from typing import Callable, Iterable, Iterator, Optional
+
+from detection.anomaly_engine import ANOMALY_STATE_PATH, AnomalyEngine
+from detection.incident_detector import (
+    ACTIONABLE_SCORE,
+    SEVERITY_LABEL,
+    SEVERITY_SCORE,
+    build_incident,
+    symptom_name
+)
+
+# ----------------------
+# Hysteresis Defaults
+# ----------------------
+
+WINDOW_SIZE = 12         # samples kept per service/metric
+TRIGGER_SAMPLES = 3      # consecutive HIGH+ samples before a metric is "hot"
+CLEAR_SAMPLES = 5        # consecutive sub-HIGH samples before it cools down
+COOLDOWN_SECONDS = 300   # minimum gap between incidents for one service
+
+
+# ----------------------
+# Samples
+# ----------------------
+
+def iter_samples(record: dict) -> Iterator[tuple[str, str, float, str, Optional[str]]]:
+    # (service, metric_path, value, severity, timestamp)
+    service = record["service"]
+    timestamp = record.get("timestamp")
+
+    if "metric" in record:
+        yield service, record["metric"], record["value"], record.get("severity", "LOW"), timestamp
+        return
+
+    def walk(obj, prefix=""):
+        for k, v in obj.items():
+            if isinstance(v, dict) and "value" in v:
+                yield service, prefix + k, v["value"], v.get("severity", "LOW"), timestamp
+            elif isinstance(v, dict):
+                yield from walk(v, prefix=f"{prefix}{k}.")
+
+    yield from walk(record)
+
+
+class MetricWindow:
+    __slots__ = ("scores", "value", "severity", "high_run", "low_run", "hot")
+
+    def __init__(self, size: int):
+        self.scores = deque(maxlen=size)
+        self.value = None
+        self.severity = "LOW"
+        self.high_run = 0
+        self.low_run = 0
+        self.hot = False
+
+
+# ----------------------
+# Detector
+# ----------------------
+
+class StreamingDetector:
+    # A metric turns hot after TRIGGER_SAMPLES consecutive actionable samples
+    # and cools after CLEAR_SAMPLES consecutive quiet ones. A service opens one
+    # incident when its first metric turns hot and stays open (no new
+    # incidents) until every metric has cooled; reopening is further limited
+    # by a per-service cooldown. Updates are O(1) per sample.
+
+    def __init__(
+        self,
+        on_incident: Callable[[dict], None],
+        window_size: int = WINDOW_SIZE,
+        trigger_samples: int = TRIGGER_SAMPLES,
+        clear_samples: int = CLEAR_SAMPLES,
+        cooldown_seconds: float = COOLDOWN_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        engine: Optional[AnomalyEngine] = None
+    ):
+        self.on_incident = on_incident
+        self.window_size = window_size
+        self.trigger_samples = trigger_samples
+        self.clear_samples = clear_samples
+        self.cooldown_seconds = cooldown_seconds
+        self.clock = clock
+        self.engine = engine
+
+        self.windows: dict[tuple[str, str], MetricWindow] = {}
+        self.snapshots: dict[str, dict] = {}
+        self.hot: dict[str, set[str]] = {}
+        self.open_incidents: dict[str, dict] = {}
+        self.last_emitted: dict[str, float] = {}
+
+    def observe(self, service: str, metric: str, value, severity: str, timestamp: Optional[str] = None) -> Optional[dict]:
+        self._update(service, metric, value, severity, timestamp)
+        return self._evaluate(service)
+
+    def process(self, records: Iterable[dict]) -> int:
+        # A snapshot record updates all of its metrics before the service is
+        # evaluated, so its incident lists every symptom at once
+        emitted = 0
+        for record in records:
+            for sample in iter_samples(record):
+                self._update(*sample)
+            if self._evaluate(record["service"]) is not None:
+                emitted += 1
+        return emitted
+
+    def _update(self, service: str, metric: str, value, severity: str, timestamp: Optional[str]):
+        window = self.windows.get((service, metric))
+        if window is None:
+            window = self.windows[(service, metric)] = MetricWindow(self.window_size)
+
+        if self.engine is not None:
+            severity = self.engine.severity(service, metric, value, timestamp) or severity
+
+        score = SEVERITY_SCORE.get(severity, 0)
+        window.scores.append(score)
+        window.value = value
+        window.severity = severity
+
+        if score >= ACTIONABLE_SCORE:
+            window.high_run += 1
+            window.low_run = 0
+        else:
+            window.low_run += 1
+            window.high_run = 0
+
+        self._update_snapshot(service, metric, value, severity, timestamp)
+
+        hot = self.hot.setdefault(service, set())
+        if not window.hot and window.high_run >= self.trigger_samples:
+            window.hot = True
+            hot.add(metric)
+        elif window.hot and window.low_run >= self.clear_samples:
+            window.hot = False
+            hot.discard(metric)
+
+    def _evaluate(self, service: str) -> Optional[dict]:
+        if not self.hot.get(service):
+            self.open_incidents.pop(service, None)
+            return None
+
+        if service in self.open_incidents:
+            return None
+
+        last = self.last_emitted.get(service)
+        if last is not None and self.clock() - last < self.cooldown_seconds:
+            return None
+
+        incident = self._build(service)
+        self.open_incidents[service] = incident
+        self.last_emitted[service] = self.clock()
+        self.on_incident(incident)
+        return incident
+
+    def _update_snapshot(self, service: str, metric: str, value, severity: str, timestamp: Optional[str]):
+        snapshot = self.snapshots.get(service)
+        if snapshot is None:
+            snapshot = self.snapshots[service] = {"timestamp": timestamp, "service": service}
+        if timestamp is not None:
+            snapshot["timestamp"] = timestamp
+
+        node = snapshot
+        *groups, name = metric.split(".")
+        for group in groups:
+            node = node.setdefault(group, {})
+        node[name] = {"value": value, "severity": severity}
+
+    def _build(self, service: str) -> dict:
+        symptoms = []
+        max_score = 0
+        for metric in sorted(self.hot[service]):
+            score = max(self.windows[(service, metric)].scores)
+            max_score = max(max_score, score)
+            symptoms.append(f"{symptom_name(metric)} is {SEVERITY_LABEL[score]}")
+
+        snapshot = json.loads(json.dumps(self.snapshots[service]))
+        return build_incident(snapshot, SEVERITY_LABEL[max_score], symptoms)
+
+
+# ----------------------
+# Sources
+# ----------------------
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def _valid_record(record) -> bool:
+    if not isinstance(record, dict) or not isinstance(record.get("service"), str):
+        return False
+    if "metric" in record and "value" not in record:
+        return False
+    if not isinstance(record.get("timestamp"), (str, type(None))):
+        return False
+    return all(
+        isinstance(metric, str) and _is_number(value) and isinstance(severity, str)
+        for _, metric, value, severity, _ in iter_samples(record)
+    )
+
+
+def _parse(line) -> Optional[dict]:
+    # Anything that isn't a sample or snapshot object with numeric values is
+    # skipped rather than left to fail deeper in, which would stop the daemon
+    # mid-stream. ValueError covers both bad JSON and undecodable bytes.
+    try:
+        record = json.loads(line)
+    except ValueError:
+        record = None
+
+    if not _valid_record(record):
+        print(f"Skipping malformed sample: {line[:200]!r}")
+        return None
+    return record
+
+
+def follow_jsonl(
+    path: str,
+    from_start: bool = False,
+    poll_interval: float = 0.5,
+    stop: Optional[threading.Event] = None
+) -> Iterator[dict]:
+    # tail -F: follows appends, and reopens from the beginning when the file
+    # is rotated (new inode) or truncated
+    f = None
+    inode = None
+    pending = ""
+
+    try:
+        while stop is None or not stop.is_set():
+            if f is None:
+                if not os.path.exists(path):
+                    time.sleep(poll_interval)
+                    continue
+                f = open(path, "r", errors="replace")
+                inode = os.fstat(f.fileno()).st_ino
+                if not from_start:
+                    f.seek(0, os.SEEK_END)
+                from_start = True  # later reopens are rotations: read them whole
+
+            line = f.readline()
+            if line:
+                pending += line
+                if pending.endswith("\n"):
+                    record = _parse(pending) if pending.strip() else None
+                    pending = ""
+                    if record is not None:
+                        yield record
+                continue
+
+            try:
+                st = os.stat(path)
+                rotated = st.st_ino != inode or st.st_size < f.tell()
+            except FileNotFoundError:
+                rotated = True
+            if rotated:
+                f.close()
+                f = None
+                pending = ""
+                continue
+
+            time.sleep(poll_interval)
+    finally:
+        if f is not None:
+            f.close()
+
+
+def listen_socket(
+    host: str,
+    port: int,
+    stop: Optional[threading.Event] = None
+) -> Iterator[dict]:
+    # Newline-delimited JSON over TCP; any number of clients multiplexed on
+    # one thread
+    selector = selectors.DefaultSelector()
+    server = socket.create_server((host, port))
+    server.setblocking(False)
+    selector.register(server, selectors.EVENT_READ)
+    buffers: dict[socket.socket, bytes] = {}
+
+    try:
+        while stop is None or not stop.is_set():
+            for key, _ in selector.select(timeout=0.5):
+                if key.fileobj is server:
+                    conn, _ = server.accept()
+                    conn.setblocking(False)
+                    selector.register(conn, selectors.EVENT_READ)
+                    buffers[conn] = b""
+                    continue
+
+                conn = key.fileobj
+                try:
+                    data = conn.recv(65536)
+                except OSError:
+                    # Reset or otherwise broken client: drop it, keep listening
+                    data = b""
+                if not data:
+                    selector.unregister(conn)
+                    conn.close()
+                    buffers.pop(conn, None)
+                    continue
+
+                *lines, buffers[conn] = (buffers[conn] + data).split(b"\n")
+                for line in lines:
+                    if line.strip():
+                        record = _parse(line)
+                        if record is not None:
+                            yield record
+    finally:
+        for conn in buffers:
+            conn.close()
+        selector.close()
+        server.close()
+
+
+# ----------------------
+# Entry Point
+# ----------------------
+
+def main():
+    parser = argparse.ArgumentParser()
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--jsonl", help="JSONL file to follow")
+    source.add_argument("--listen", help="HOST:PORT to accept newline-delimited JSON on")
+    parser.add_argument("--from-start", action="store_true", help="Read the JSONL file from the beginning")
+    parser.add_argument("--cooldown", type=float, default=COOLDOWN_SECONDS)
+    parser.add_argument("--run-workflow", action="store_true", help="Invoke the incident graph for each incident")
+    parser.add_argument("--anomaly", action="store_true", help="Compute severities from raw values instead of sample labels")
+    args = parser.parse_args()
+
+    if args.run_workflow:
+        from workflows.incident_graph import build_incident_graph
+        from workflows.run_workflow import run_incident
+
+        graph = build_incident_graph()
+
+        def on_incident(incident):
+            print(f"Incident {incident['incident_id']} ({incident['service']}, {incident['severity']})")
+            run_incident(graph, incident)
+    else:
+        def on_incident(incident):
+            print(json.dumps(incident, indent=2))
+
+    if args.jsonl:
+        records = follow_jsonl(args.jsonl, from_start=args.from_start)
+    else:
+        host, port = args.listen.rsplit(":", 1)
+        records = listen_socket(host, int(port))
+
+    engine = AnomalyEngine.load(ANOMALY_STATE_PATH) if args.anomaly else None
+    detector = StreamingDetector(on_incident, cooldown_seconds=args.cooldown, engine=engine)
+    try:
+        detector.process(records)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if engine is not None:
+            engine.save(ANOMALY_STATE_PATH)
+        if args.run_workflow:
+            from reporting.render_queue import drain_render_queue
+            drain_render_queue()
+
+
+if __name__ == "__main__":
+    main()
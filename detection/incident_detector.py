@@ -11,8 +11,32 @@ SEVERITY_SCORE = {
     "CRITICAL": 3
 }
 
+SEVERITY_LABEL = {v: k for k, v in SEVERITY_SCORE.items()}
 
-def detect_incident(metrics_path: str):
+# Severity at which a metric counts as a symptom
+ACTIONABLE_SCORE = SEVERITY_SCORE["HIGH"]
+
+
+def symptom_name(metric_path: str) -> str:
+    # "database.connection_pool_usage_percent" -> "Database Connection Pool Usage Percent"
+    return metric_path.replace(".", " ").replace("_", " ").title()
+
+
+def build_incident(metrics: dict, severity: str, symptoms: list[str]) -> dict:
+    return {
+        "incident_id": f"INC-{uuid4().hex[:6].upper()}",
+        "service": metrics["service"],
+        "severity": severity,
+        "detected_at": datetime.utcnow().isoformat() + "Z",
+        "symptoms": symptoms,
+        "metrics_snapshot": metrics
+    }
+
+
+def detect_incident(metrics_path: str, engine=None):
+    # With an AnomalyEngine, severities are computed from the raw values and
+    # written back into the snapshot (so downstream analysis sees them);
+    # metrics still warming up keep their provided label.
     with open(metrics_path, "r") as f:
         metrics = json.load(f)
 
@@ -21,33 +45,25 @@ def detect_incident(metrics_path: str):
 
     def walk(obj, prefix=""):
         for k, v in obj.items():
-            if isinstance(v, dict) and "severity" in v and "value" in v:
+            if isinstance(v, dict) and "value" in v and (engine is not None or "severity" in v):
+                if engine is not None:
+                    computed = engine.severity(metrics["service"], prefix + k, v["value"], metrics.get("timestamp"))
+                    v["severity"] = computed or v.get("severity", "LOW")
                 sev = v["severity"]
                 severity_scores.append(SEVERITY_SCORE[sev])
 
-                if SEVERITY_SCORE[sev] >= 2:
-                    name = f"{prefix}{k}".replace("_", " ").title()
-                    symptoms.append(f"{name} is {sev}")
+                if SEVERITY_SCORE[sev] >= ACTIONABLE_SCORE:
+                    symptoms.append(f"{symptom_name(prefix + k)} is {sev}")
 
             elif isinstance(v, dict):
-                walk(v, prefix=f"{k} ")
+                walk(v, prefix=f"{prefix}{k}.")
 
     walk(metrics)
 
-    if not severity_scores or max(severity_scores) < 2:
+    if not severity_scores or max(severity_scores) < ACTIONABLE_SCORE:
         return None
 
-    max_sev = max(severity_scores)
-    severity_label = {v: k for k, v in SEVERITY_SCORE.items()}[max_sev]
-
-    return {
-        "incident_id": f"INC-{uuid4().hex[:6].upper()}",
-        "service": metrics["service"],
-        "severity": severity_label,
-        "detected_at": datetime.utcnow().isoformat() + "Z",
-        "symptoms": symptoms,
-        "metrics_snapshot": metrics
-    }
+    return build_incident(metrics, SEVERITY_LABEL[max(severity_scores)], symptoms)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,176 @@
+# observability/tracing.py
+
+import functools
+import hashlib
+import json
+import os
+import resource
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Optional
+
+# TRACE_EXPORT=0 keeps spans on the incident state only
+TRACE_EXPORT = os.getenv("TRACE_EXPORT", "1") != "0"
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "reports/traces.jsonl")
+
+SERVICE_NAME = "sentinel-aiops"
+
+# Counters every span carries, zero when a node did none of it
+COUNTERS = ("bytes_read", "llm_calls", "llm_input_tokens", "llm_output_tokens", "llm_cache_hits")
+
+# ----------------------
+# Counters
+# ----------------------
+# Code deep inside a node reports what it did with record(); the counts go to
+# whichever traced node is running in the current context (asyncio tasks
+# inherit it) and are dropped when nothing is being traced. Work done in
+# child processes is recorded by the parent once results come back.
+
+_counters: ContextVar[Optional[dict]] = ContextVar("trace_counters", default=None)
+_counters_lock = threading.Lock()
+
+
+def record(name: str, amount: int = 1):
+    counters = _counters.get()
+    if counters is not None:
+        with _counters_lock:
+            counters[name] = counters.get(name, 0) + amount
+
+
+# ----------------------
+# Node Spans
+# ----------------------
+
+def _children_cpu() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def traced(name: str, node: Callable[[dict], dict]) -> Callable[[dict], dict]:
+    # Wraps a graph node so its partial update also carries one span under
+    # "trace" (a list the state concatenates). CPU time is the node's own
+    # thread plus any child processes it waited for (log analysis pools);
+    # parallel branches each get their own thread, so they don't mix.
+    @functools.wraps(node)
+    def wrapper(state: dict) -> dict:
+        counters = dict.fromkeys(COUNTERS, 0)
+        token = _counters.set(counters)
+        start_ns = time.time_ns()
+        wall = time.perf_counter()
+        cpu = time.thread_time() + _children_cpu()
+        try:
+            update = node(state)
+        finally:
+            _counters.reset(token)
+        elapsed = time.perf_counter() - wall
+
+        span = {
+            "node": name,
+            "start_ns": start_ns,
+            "end_ns": start_ns + int(elapsed * 1e9),
+            "wall_ms": round(elapsed * 1000, 2),
+            "cpu_ms": round((time.thread_time() + _children_cpu() - cpu) * 1000, 2),
+            **counters
+        }
+        return {**update, "trace": [span]}
+
+    return wrapper
+
+
+def trace_summary(trace: list[dict]) -> dict:
+    # Totals for one incident; wall time is first start to last end, since
+    # the metrics and log branches overlap
+    if not trace:
+        return {}
+    summary = {
+        "wall_ms": round((max(s["end_ns"] for s in trace) - min(s["start_ns"] for s in trace)) / 1e6, 2),
+        "cpu_ms": round(sum(s["cpu_ms"] for s in trace), 2)
+    }
+    for name in COUNTERS:
+        summary[name] = sum(s.get(name, 0) for s in trace)
+    return summary
+
+
+# ----------------------
+# OpenTelemetry Export
+# ----------------------
+# One OTLP/JSON ExportTraceServiceRequest per line, the format the
+# OpenTelemetry Collector's file exporter writes and its otlpjsonfile
+# receiver reads: a root "incident" span with a child per node.
+
+def _attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def _span_id() -> str:
+    return os.urandom(8).hex()
+
+
+def to_otlp(incident: dict, trace: list[dict]) -> dict:
+    # The trace id is derived from the incident id, so every export for an
+    # incident lands in the same trace
+    trace_id = hashlib.sha256(incident["incident_id"].encode("utf-8")).hexdigest()[:32]
+    root_id = _span_id()
+    summary = trace_summary(trace)
+
+    spans = [{
+        "traceId": trace_id,
+        "spanId": root_id,
+        "name": "incident",
+        "kind": 1,
+        "startTimeUnixNano": str(min(s["start_ns"] for s in trace)),
+        "endTimeUnixNano": str(max(s["end_ns"] for s in trace)),
+        "attributes": [
+            _attribute("incident.id", incident["incident_id"]),
+            _attribute("incident.service", incident["service"]),
+            _attribute("incident.severity", incident["severity"]),
+            *(_attribute(f"sentinel.{k}", v) for k, v in summary.items() if k != "wall_ms")
+        ],
+        "status": {"code": 1}
+    }]
+
+    for s in trace:
+        spans.append({
+            "traceId": trace_id,
+            "spanId": _span_id(),
+            "parentSpanId": root_id,
+            "name": s["node"],
+            "kind": 1,
+            "startTimeUnixNano": str(s["start_ns"]),
+            "endTimeUnixNano": str(s["end_ns"]),
+            "attributes": [
+                _attribute("sentinel.cpu_ms", s["cpu_ms"]),
+                *(_attribute(f"sentinel.{k}", s.get(k, 0)) for k in COUNTERS)
+            ],
+            "status": {"code": 1}
+        })
+
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [_attribute("service.name", SERVICE_NAME)]},
+            "scopeSpans": [{"scope": {"name": "sentinel.incident_graph"}, "spans": spans}]
+        }]
+    }
+
+
+def export_trace(incident: dict, trace: list[dict], path: str = TRACE_EXPORT_PATH):
+    if not TRACE_EXPORT or not trace:
+        return
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    line = (json.dumps(to_otlp(incident, trace)) + "\n").encode("utf-8")
+
+    # A single O_APPEND write per incident, so runner workers exporting at
+    # the same time never interleave lines
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
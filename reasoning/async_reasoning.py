@@ -0,0 +1,88 @@
+# reasoning/async_reasoning.py
+
+import asyncio
+from typing import Optional
+
+from reasoning.llm_client import INCIDENT_DEADLINE, close_async_client
+from reasoning.root_cause_ai import (
+    REASONING_MODE,
+    ROOT_CAUSE_FALLBACK,
+    combined_root_cause_async,
+    determine_root_cause_async,
+    root_cause_resolution,
+    settle_root_cause
+)
+from reasoning.rule_engine import evaluate_rules
+from recommendations.recommendation_engine import (
+    EXPLANATION_FALLBACK,
+    build_recommendations,
+    generate_shared_explanation_async
+)
+
+
+async def reason_incident(
+    snapshot: dict,
+    metrics_analysis: dict,
+    log_analysis: dict,
+    severity: str,
+    deadline: float = INCIDENT_DEADLINE
+) -> dict:
+    # Same resolution as resolve_root_cause: a confident rule answers without
+    # the LLM; otherwise root cause and explanation (one call in combined
+    # mode, two otherwise) run inside one overall deadline. Each value is
+    # kept as soon as it arrives, so a root cause that finished in time
+    # survives an explanation that didn't; whatever is missing falls back to
+    # the placeholders. Recommendations are always produced.
+    rule = evaluate_rules(snapshot, log_analysis)
+
+    if rule is not None and rule["confident"]:
+        resolution = root_cause_resolution(rule["root_cause"], rule["explanation"], "rules", rule["confidence"])
+    else:
+        root_cause: Optional[str] = None
+        explanation = EXPLANATION_FALLBACK
+
+        try:
+            async with asyncio.timeout(deadline):
+                parsed = None
+                if REASONING_MODE == "combined":
+                    parsed = await combined_root_cause_async(metrics_analysis, log_analysis)
+
+                if parsed is not None:
+                    root_cause, explanation = parsed
+                else:
+                    root_cause = await determine_root_cause_async(metrics_analysis, log_analysis)
+                    if root_cause != ROOT_CAUSE_FALLBACK:
+                        explanation = await generate_shared_explanation_async(root_cause)
+        except TimeoutError:
+            pass
+        except Exception:
+            # The combined call couldn't reach a backend
+            pass
+
+        resolution = settle_root_cause(rule, root_cause or ROOT_CAUSE_FALLBACK, explanation)
+
+    return {
+        **resolution,
+        "recommendations": build_recommendations(resolution["root_cause"], severity, resolution["explanation"])
+    }
+
+
+async def reason_incidents(items: list[dict], deadline: float = INCIDENT_DEADLINE) -> list[dict]:
+    # items: [{"snapshot": ..., "metrics_analysis": ..., "log_analysis": ..., "severity": ...}]
+    # All incidents run concurrently; the shared client's semaphore caps how
+    # many requests are actually in flight.
+    return await asyncio.gather(*(
+        reason_incident(i["snapshot"], i["metrics_analysis"], i["log_analysis"], i["severity"], deadline)
+        for i in items
+    ))
+
+
+def run_reasoning(items: list[dict], deadline: float = INCIDENT_DEADLINE) -> list[dict]:
+    # Sync entry point for scripts: one event loop for the whole batch
+    async def main():
+        try:
+            return await reason_incidents(items, deadline)
+        finally:
+            await close_async_client()
+
+    return asyncio.run(main())
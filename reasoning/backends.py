@@ -0,0 +1,311 @@
+# reasoning/backends.py
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from openai import AsyncOpenAI, OpenAI
+
+from observability.tracing import record
+from reasoning.prompt_builder import estimate_tokens
+
+# ----------------------
+# Defaults
+# ----------------------
+
+REMOTE_BASE_URL = "https://openrouter.ai/api/v1"
+REMOTE_MODEL = "meta-llama/llama-3.3-70b-instruct:free"
+LOCAL_BASE_URL = "http://127.0.0.1:8080/v1"
+LOCAL_MODEL = "local"
+STUB_MODEL = "stub"
+
+FAILURE_THRESHOLD = 3    # consecutive errors before a backend is skipped
+RETRY_AFTER = 30         # seconds a skipped backend sits out
+
+
+# ----------------------
+# Metrics
+# ----------------------
+
+class BackendStats:
+    __slots__ = ("calls", "errors", "consecutive_errors", "total_latency", "max_latency", "last_error", "last_failure")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last_error: Optional[str] = None
+        self.last_failure = 0.0
+
+    def record(self, latency: float, error: Optional[BaseException] = None):
+        self.calls += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        if error is None:
+            self.consecutive_errors = 0
+        else:
+            self.errors += 1
+            self.consecutive_errors += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+            self.last_failure = time.monotonic()
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.calls, 3) if self.calls else 0.0,
+            "avg_latency_ms": round(self.total_latency / self.calls * 1000, 1) if self.calls else 0.0,
+            "max_latency_ms": round(self.max_latency * 1000, 1),
+            "last_error": self.last_error
+        }
+
+
+def record_usage(prompt: str, text: str, usage=None):
+    # Token counts for the running trace span: as reported by the API when
+    # it reports them, estimated from the text otherwise
+    record("llm_calls")
+    record("llm_input_tokens", usage.prompt_tokens if usage else estimate_tokens(prompt))
+    record("llm_output_tokens", usage.completion_tokens if usage else estimate_tokens(text))
+
+
+# ----------------------
+# Backends
+# ----------------------
+# A backend turns a prompt into text. cacheable says whether its answers may
+# go in the response cache (stub answers must not shadow real ones).
+
+class LLMBackend(ABC):
+    name = "backend"
+    model = ""
+    cacheable = True
+
+    def __init__(self):
+        self.stats = BackendStats()
+
+    @abstractmethod
+    def complete(self, prompt: str, temperature: float, max_tokens: int, timeout: float) -> str:
+        ...
+
+    @abstractmethod
+    async def acomplete(self, prompt: str, temperature: float, max_tokens: int, timeout: float) -> str:
+        ...
+
+    async def aclose(self):
+        pass
+
+    def available(self) -> bool:
+        # Skipped after FAILURE_THRESHOLD consecutive errors, until RETRY_AFTER
+        # has passed; then one call is let through to probe it
+        return (
+            self.stats.consecutive_errors < FAILURE_THRESHOLD
+            or time.monotonic() - self.stats.last_failure >= RETRY_AFTER
+        )
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    # Any /chat/completions endpoint: OpenRouter, or a local server (vLLM,
+    # llama.cpp, Ollama, reasoning.stub_server). Clients are created on first
+    # use, the async one once per event loop. The SDK's own retries are off:
+    # a failed call goes straight back to BackendChain, which fails over.
+
+    def __init__(self, name: str, base_url: str, model: str, api_key: Optional[str]):
+        super().__init__()
+        self.name = name
+        self.base_url = base_url
+        self.model = model
+        self.api_key = api_key or "none"
+        self._client: Optional[OpenAI] = None
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+
+    def _messages(self, prompt: str) -> list[dict]:
+        return [{"role": "user", "content": prompt}]
+
+    def complete(self, prompt: str, temperature: float, max_tokens: int, timeout: float) -> str:
+        if self._client is None:
+            self._client = OpenAI(base_url=self.base_url, api_key=self.api_key, max_retries=0)
+        completion = self._client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(prompt),
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout
+        )
+        text = completion.choices[0].message.content.strip()
+        record_usage(prompt, text, completion.usage)
+        return text
+
+    async def acomplete(self, prompt: str, temperature: float, max_tokens: int, timeout: float) -> str:
+        loop = asyncio.get_running_loop()
+        async_client = self._async_clients.get(loop)
+        if async_client is None:
+            async_client = self._async_clients[loop] = AsyncOpenAI(
+                base_url=self.base_url, api_key=self.api_key, max_retries=0
+            )
+        completion = await async_client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(prompt),
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout
+        )
+        text = completion.choices[0].message.content.strip()
+        record_usage(prompt, text, completion.usage)
+        return text
+
+    async def aclose(self):
+        async_client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if async_client is not None:
+            await async_client.close()
+
+
+INCIDENT_NUMBER_RE = re.compile(r"^Incident (\d+):", re.MULTILINE)
+
+
+def stub_answer(prompt: str) -> str:
+    # Deterministic, well-formed answers for every prompt shape the reasoning
+    # code sends: numbered batch JSON, single JSON, or one plain sentence.
+    # The same prompt always gets the same text.
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+    answer = {
+        "root_cause": f"Stub root cause {digest}: database connection pool saturation.",
+        "explanation": f"Stub explanation {digest}: generated without a language model."
+    }
+
+    if "keyed by incident number" in prompt:
+        numbers = INCIDENT_NUMBER_RE.findall(prompt)
+        return json.dumps({n: answer for n in numbers})
+    if "Respond with ONLY a JSON object" in prompt:
+        return json.dumps(answer)
+    if "Explain the root cause" in prompt:
+        return answer["explanation"]
+    return answer["root_cause"]
+
+
+class StubBackend(LLMBackend):
+    # In-process and deterministic, with an optional fixed latency to stand in
+    # for a real model in benchmarks
+    name = "stub"
+    model = STUB_MODEL
+    cacheable = False
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__()
+        self.latency = latency
+
+    def complete(self, prompt: str, temperature: float, max_tokens: int, timeout: float) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        text = stub_answer(prompt)
+        record_usage(prompt, text)
+        return text
+
+    async def acomplete(self, prompt: str, temperature: float, max_tokens: int, timeout: float) -> str:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        text = stub_answer(prompt)
+        record_usage(prompt, text)
+        return text
+
+
+# ----------------------
+# Failover
+# ----------------------
+
+class BackendChain:
+    # Tries backends in order, recording latency and errors for each, and
+    # moves to the next one on any error. Backends that keep failing are
+    # skipped for a while, except that the last resort is always tried.
+
+    def __init__(self, backends: list[LLMBackend]):
+        if not backends:
+            raise ValueError("BackendChain needs at least one backend")
+        self.backends = backends
+        self.model = "+".join(b.model for b in backends)
+        self._lock = threading.Lock()
+
+    def _candidates(self) -> list[LLMBackend]:
+        candidates = [b for b in self.backends if b.available()]
+        return candidates or self.backends[-1:]
+
+    def _record(self, backend: LLMBackend, started: float, error: Optional[BaseException] = None):
+        with self._lock:
+            backend.stats.record(time.perf_counter() - started, error)
+
+    def complete(self, prompt: str, temperature: float, max_tokens: int, timeout: float) -> tuple[str, LLMBackend]:
+        last_error: Optional[BaseException] = None
+        for backend in self._candidates():
+            started = time.perf_counter()
+            try:
+                text = backend.complete(prompt, temperature, max_tokens, timeout)
+            except Exception as e:
+                self._record(backend, started, e)
+                last_error = e
+                continue
+            self._record(backend, started)
+            return text, backend
+        raise last_error
+
+    async def acomplete(self, prompt: str, temperature: float, max_tokens: int, timeout: float) -> tuple[str, LLMBackend]:
+        last_error: Optional[BaseException] = None
+        for backend in self._candidates():
+            started = time.perf_counter()
+            try:
+                text = await backend.acomplete(prompt, temperature, max_tokens, timeout)
+            except Exception as e:
+                self._record(backend, started, e)
+                last_error = e
+                continue
+            self._record(backend, started)
+            return text, backend
+        raise last_error
+
+    async def aclose(self):
+        for backend in self.backends:
+            await backend.aclose()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {b.name: b.stats.to_dict() for b in self.backends}
+
+
+# ----------------------
+# Configuration
+# ----------------------
+# LLM_BACKENDS is the failover order, e.g. "remote,local,stub" (default
+# "remote"). Per backend:
+#   remote: LLM_BASE_URL, LLM_MODEL, OPENROUTER_API_KEY
+#   local:  LOCAL_LLM_BASE_URL, LOCAL_LLM_MODEL, LOCAL_LLM_API_KEY
+#   stub:   LLM_STUB_LATENCY (seconds)
+
+def build_backend(name: str) -> LLMBackend:
+    if name == "remote":
+        return OpenAICompatibleBackend(
+            "remote",
+            os.getenv("LLM_BASE_URL", REMOTE_BASE_URL),
+            os.getenv("LLM_MODEL", REMOTE_MODEL),
+            os.getenv("OPENROUTER_API_KEY")
+        )
+    if name == "local":
+        return OpenAICompatibleBackend(
+            "local",
+            os.getenv("LOCAL_LLM_BASE_URL", LOCAL_BASE_URL),
+            os.getenv("LOCAL_LLM_MODEL", LOCAL_MODEL),
+            os.getenv("LOCAL_LLM_API_KEY")
+        )
+    if name == "stub":
+        return StubBackend(float(os.getenv("LLM_STUB_LATENCY", 0)))
+    raise ValueError(f"Unknown LLM backend: {name!r}")
+
+
+def build_backend_chain(spec: Optional[str] = None) -> BackendChain:
+    spec = spec if spec is not None else os.getenv("LLM_BACKENDS", "remote")
+    return BackendChain([build_backend(name.strip()) for name in spec.split(",") if name.strip()])
@@ -0,0 +1,179 @@
+# reasoning/batch_reasoning.py
+
+import asyncio
+import json
+
+from reasoning.llm_cache import cache_key, get_cache
+from reasoning.llm_client import INCIDENT_DEADLINE, acomplete_uncached, close_async_client, model_key
+from reasoning.prompt_builder import render_facts
+from reasoning.root_cause_ai import (
+    COMBINED_MAX_TOKENS,
+    COMBINED_TEMPERATURE,
+    JSON_OBJECT_RE,
+    ROOT_CAUSE_FALLBACK,
+    combined_cache_inputs,
+    determine_root_cause_and_explanation_async,
+    parse_combined_response
+)
+from recommendations.recommendation_engine import EXPLANATION_FALLBACK, build_recommendations
+
+# ----------------------
+# Limits
+# ----------------------
+
+MAX_BATCH_SIZE = 8   # distinct fact sets per prompt
+STORM_DEADLINE = 2 * INCIDENT_DEADLINE
+
+# ----------------------
+# Batched Reasoning
+# ----------------------
+# In an incident storm most incidents share the same symptoms (metric
+# statuses and error signatures), so reasoning is done once per distinct fact
+# set, several fact sets per prompt. Each answer is cached under the same key
+# the single-incident combined call uses, so later incidents with those facts
+# hit the cache either way.
+
+
+def build_batch_prompt(facts: list[tuple[dict, dict]]) -> str:
+    incidents = "\n".join(
+        f"""
+Incident {n}:
+{render_facts(metrics_analysis, log_analysis)}
+"""
+        for n, (metrics_analysis, log_analysis) in enumerate(facts, start=1)
+    )
+
+    return f"""
+You are a Site Reliability Engineer.
+
+Below are {len(facts)} numbered incidents. For EACH incident, based ONLY on
+its own facts, determine the most likely root cause and explain it.
+Do NOT suggest actions.
+Do NOT speculate beyond the facts.
+
+Respond with ONLY a JSON object keyed by incident number, no other text:
+{{"1": {{"root_cause": "<one concise sentence>", "explanation": "<one concise sentence>"}}, ...}}
+{incidents}"""
+
+
+def parse_batch_response(text: str, count: int) -> dict[int, tuple[str, str]]:
+    # Keeps every well-formed answer; missing or malformed ones are left out
+    # and reasoned about individually
+    match = JSON_OBJECT_RE.search(text or "")
+    if match is None:
+        return {}
+    try:
+        data = json.loads(match.group(0))
+    except ValueError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+
+    answers = {}
+    for n in range(1, count + 1):
+        answer = data.get(str(n))
+        if isinstance(answer, dict):
+            parsed = parse_combined_response(json.dumps(answer))
+            if parsed is not None:
+                answers[n - 1] = parsed
+    return answers
+
+
+def _fact_cache_key(metrics_analysis: dict, log_analysis: dict) -> str:
+    return cache_key(
+        combined_cache_inputs(metrics_analysis, log_analysis),
+        model_key(), COMBINED_TEMPERATURE, COMBINED_MAX_TOKENS
+    )
+
+
+async def _reason_batch(facts: list[tuple[dict, dict]], keys: list[str], answers: dict) -> list[str]:
+    # Returns the keys a reply came back without answers for. A failed call
+    # returns none: retrying each fact set alone against a backend that is
+    # down only multiplies the failed calls.
+    prompt = build_batch_prompt(facts)
+    try:
+        # Not cached as a whole: the per-fact answers are stored below
+        text, backend = await acomplete_uncached(
+            prompt,
+            temperature=COMBINED_TEMPERATURE,
+            max_tokens=COMBINED_MAX_TOKENS * len(facts)
+        )
+    except Exception:
+        return []
+
+    cache = get_cache() if backend.cacheable else None
+    parsed = parse_batch_response(text, len(facts))
+    for i, (root_cause, explanation) in parsed.items():
+        answers[keys[i]] = (root_cause, explanation)
+        if cache is not None:
+            cache.put(keys[i], json.dumps({"root_cause": root_cause, "explanation": explanation}))
+    return [key for i, key in enumerate(keys) if i not in parsed]
+
+
+async def _reason_single(facts: tuple[dict, dict], key: str, answers: dict):
+    # Left unanswered (placeholders) if the backend can't be reached
+    try:
+        answers[key] = await determine_root_cause_and_explanation_async(*facts)
+    except Exception:
+        return
+
+
+async def reason_storm(
+    items: list[dict],
+    batch_size: int = MAX_BATCH_SIZE,
+    deadline: float = STORM_DEADLINE
+) -> list[dict]:
+    # items: [{"metrics_analysis": ..., "log_analysis": ..., "severity": ...}]
+    # Returns one {root_cause, explanation, recommendations} per item, in order.
+    keys = [_fact_cache_key(i["metrics_analysis"], i["log_analysis"]) for i in items]
+
+    unique: dict[str, tuple[dict, dict]] = {}
+    for key, item in zip(keys, items):
+        unique.setdefault(key, (item["metrics_analysis"], item["log_analysis"]))
+
+    answers: dict[str, tuple[str, str]] = {}
+    cache = get_cache()
+    if cache is not None:
+        for key in unique:
+            parsed = parse_combined_response(cache.get(key) or "")
+            if parsed is not None:
+                answers[key] = parsed
+
+    try:
+        async with asyncio.timeout(deadline):
+            pending = [k for k in unique if k not in answers]
+            missing = await asyncio.gather(*(
+                _reason_batch([unique[k] for k in chunk], chunk, answers)
+                for chunk in (pending[i:i + batch_size] for i in range(0, len(pending), batch_size))
+            ))
+
+            # Answers a batch reply left out go through the single path
+            await asyncio.gather(*(
+                _reason_single(unique[k], k, answers) for chunk in missing for k in chunk
+            ))
+    except TimeoutError:
+        pass
+
+    results = []
+    for key, item in zip(keys, items):
+        root_cause, explanation = answers.get(key, (ROOT_CAUSE_FALLBACK, EXPLANATION_FALLBACK))
+        results.append({
+            "root_cause": root_cause,
+            "explanation": explanation,
+            "recommendations": build_recommendations(root_cause, item["severity"], explanation)
+        })
+    return results
+
+
+def run_storm_reasoning(
+    items: list[dict],
+    batch_size: int = MAX_BATCH_SIZE,
+    deadline: float = STORM_DEADLINE
+) -> list[dict]:
+    async def main():
+        try:
+            return await reason_storm(items, batch_size, deadline)
+        finally:
+            await close_async_client()
+
+    return asyncio.run(main())
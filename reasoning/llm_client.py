@@ -0,0 +1,144 @@
+# reasoning/llm_client.py
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Callable, Optional
+from dotenv import load_dotenv
+
+from observability.tracing import record
+from reasoning.backends import BackendChain, build_backend_chain
+from reasoning.llm_cache import cache_key, get_cache
+
+load_dotenv()
+
+# ----------------------
+# Limits
+# ----------------------
+
+REQUEST_TIMEOUT = 10           # seconds per LLM call
+INCIDENT_DEADLINE = 20         # seconds for all reasoning on one incident
+MAX_CONCURRENT_REQUESTS = 8    # in-flight async calls per event loop
+
+# ----------------------
+# Backends
+# ----------------------
+# Which backends answer, and in what failover order, comes from LLM_BACKENDS
+# (see reasoning/backends.py); the chain is built on first use so importing
+# needs no API key.
+
+_chain: Optional[BackendChain] = None
+_chain_lock = threading.Lock()
+
+# One semaphore per event loop caps in-flight async calls across backends
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def get_backends() -> BackendChain:
+    global _chain
+    with _chain_lock:
+        if _chain is None:
+            _chain = build_backend_chain()
+        return _chain
+
+
+def set_backends(chain: BackendChain):
+    # For scripts and benchmarks that pick backends in code
+    global _chain
+    with _chain_lock:
+        _chain = chain
+
+
+def backend_stats() -> dict:
+    return get_backends().stats()
+
+
+def model_key() -> str:
+    # What cache keys are scoped to: a different backend setup gets its own
+    # cache entries
+    return get_backends().model
+
+
+def _semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    return semaphore
+
+
+# ----------------------
+# Completions
+# ----------------------
+# cache_inputs lets callers key the response cache on the facts that matter
+# rather than on the full prompt text (which may embed counts and timestamps
+# that change every run); by default the prompt itself is the key. When
+# cache_if is given, only responses it accepts are stored, so a malformed
+# answer is retried next time instead of being served from the cache.
+
+def _cache_lookup(prompt: str, temperature: float, max_tokens: int, cache_inputs: Optional[Any]) -> tuple:
+    cache = get_cache()
+    if cache is None:
+        return None, None, None
+    key = cache_key(cache_inputs if cache_inputs is not None else prompt, model_key(), temperature, max_tokens)
+    cached = cache.get(key)
+    if cached is not None:
+        record("llm_cache_hits")
+    return cache, key, cached
+
+
+def _store(cache, key: str, text: str, backend, cache_if: Optional[Callable[[str], bool]]):
+    if cache is not None and backend.cacheable and (cache_if is None or cache_if(text)):
+        cache.put(key, text)
+
+
+def complete(
+    prompt: str,
+    temperature: float,
+    max_tokens: int,
+    timeout: float = REQUEST_TIMEOUT,
+    cache_inputs: Optional[Any] = None,
+    cache_if: Optional[Callable[[str], bool]] = None
+) -> str:
+    cache, key, cached = _cache_lookup(prompt, temperature, max_tokens, cache_inputs)
+    if cached is not None:
+        return cached
+
+    text, backend = get_backends().complete(prompt, temperature, max_tokens, timeout)
+    _store(cache, key, text, backend, cache_if)
+    return text
+
+
+async def acomplete(
+    prompt: str,
+    temperature: float,
+    max_tokens: int,
+    timeout: float = REQUEST_TIMEOUT,
+    cache_inputs: Optional[Any] = None,
+    cache_if: Optional[Callable[[str], bool]] = None
+) -> str:
+    cache, key, cached = _cache_lookup(prompt, temperature, max_tokens, cache_inputs)
+    if cached is not None:
+        return cached
+
+    text, backend = await acomplete_uncached(prompt, temperature, max_tokens, timeout)
+    _store(cache, key, text, backend, cache_if)
+    return text
+
+
+async def acomplete_uncached(
+    prompt: str,
+    temperature: float,
+    max_tokens: int,
+    timeout: float = REQUEST_TIMEOUT
+):
+    # For callers that cache on their own terms; returns (text, backend) so
+    # they can honour backend.cacheable
+    async with _semaphore():
+        return await get_backends().acomplete(prompt, temperature, max_tokens, timeout)
+
+
+async def close_async_client():
+    # Call before the loop ends to release pooled connections
+    _semaphores.pop(asyncio.get_running_loop(), None)
+    await get_backends().aclose()
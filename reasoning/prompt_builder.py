@@ -0,0 +1,121 @@
+# reasoning/prompt_builder.py
+
+import math
+from collections import Counter
+
+# ----------------------
+# Budget
+# ----------------------
+
+CHARS_PER_TOKEN = 4          # rough average for English/log text
+DEFAULT_TOKEN_BUDGET = 512   # for the facts section of one incident
+MAX_ERROR_CHARS = 200        # per error line
+
+SEVERITY_RANK = {
+    "CRITICAL": 0,
+    "HIGH": 1,
+    "MEDIUM": 2,
+    "LOW": 3,
+    "NORMAL": 4,
+    "UNKNOWN": 5
+}
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _truncate(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+# ----------------------
+# Fact Ranking
+# ----------------------
+
+def ranked_metrics(metrics_analysis: dict) -> list[str]:
+    # Worst statuses first, then by name so equal inputs give equal prompts
+    statuses = [
+        (key[:-len("_status")].replace("_", " "), value)
+        for key, value in metrics_analysis.items()
+        if key.endswith("_status")
+    ]
+    statuses.sort(key=lambda s: (SEVERITY_RANK.get(s[1], len(SEVERITY_RANK)), s[0]))
+    return [f"- {name}: {status}" for name, status in statuses]
+
+
+def ranked_errors(log_analysis: dict) -> list[str]:
+    # Mined signatures already carry counts; plain key_errors are collapsed
+    # here. Most frequent first, ties broken by text.
+    signatures = log_analysis.get("error_signatures")
+    if signatures:
+        counts = Counter()
+        for s in signatures:
+            counts[s["template"]] += s["count"]
+    else:
+        counts = Counter(log_analysis.get("key_errors", []))
+
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    return [f"- ({count}x) {_truncate(error, MAX_ERROR_CHARS)}" for error, count in ranked]
+
+
+# ----------------------
+# Compaction
+# ----------------------
+
+def compact_facts(
+    metrics_analysis: dict,
+    log_analysis: dict,
+    budget: int = DEFAULT_TOKEN_BUDGET
+) -> tuple[str, dict]:
+    # Renders the facts section within budget tokens. Metric statuses and
+    # summaries are always included; error lines are added in rank order until
+    # the budget is reached and the rest are counted in one closing line.
+    # Returns the text and {"raw_tokens", "tokens", "tokens_saved"}, where
+    # raw_tokens is what embedding both dicts directly would have cost.
+    header = ["Metrics analysis:"]
+    header += ranked_metrics(metrics_analysis)
+    if metrics_analysis.get("summary"):
+        header.append(f"Summary: {metrics_analysis['summary']}")
+
+    header += [
+        "",
+        "Log analysis:",
+        f"Errors: {log_analysis.get('error_count', 0)}, warnings: {log_analysis.get('warning_count', 0)}"
+    ]
+    if log_analysis.get("summary"):
+        header.append(f"Summary: {log_analysis['summary']}")
+
+    errors = ranked_errors(log_analysis)
+    if errors:
+        header.append("Distinct errors (most frequent first):")
+
+    lines = header
+    used = estimate_tokens("\n".join(lines))
+    # Reserve room for the omission line so it never pushes past the budget
+    reserve = estimate_tokens(f"- ... {len(errors)} more distinct errors omitted\n")
+
+    kept = 0
+    for line in errors:
+        cost = estimate_tokens(line + "\n")
+        if used + cost + reserve > budget:
+            break
+        lines.append(line)
+        used += cost
+        kept += 1
+
+    if kept < len(errors):
+        lines.append(f"- ... {len(errors) - kept} more distinct errors omitted")
+
+    text = "\n".join(lines)
+    raw_tokens = estimate_tokens(f"{metrics_analysis}\n{log_analysis}")
+    tokens = estimate_tokens(text)
+    return text, {
+        "raw_tokens": raw_tokens,
+        "tokens": tokens,
+        "tokens_saved": max(raw_tokens - tokens, 0)
+    }
+
+
+def render_facts(metrics_analysis: dict, log_analysis: dict, budget: int = DEFAULT_TOKEN_BUDGET) -> str:
+    return compact_facts(metrics_analysis, log_analysis, budget)[0]
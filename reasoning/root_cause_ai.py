@@ -1,15 +1,30 @@
+import json
 import os
-from dotenv import load_dotenv
-from openai import OpenAI
+import re
+from typing import Optional
 
-load_dotenv()
-
-client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=os.getenv("OPENROUTER_API_KEY"),
+from reasoning.llm_client import acomplete, complete
+from reasoning.prompt_builder import render_facts
+from reasoning.rule_engine import evaluate_rules
+from recommendations.recommendation_engine import (
+    EXPLANATION_FALLBACK,
+    generate_shared_explanation,
+    generate_shared_explanation_async
 )
-def determine_root_cause(metrics_analysis: dict, log_analysis: dict) -> str:
-    prompt = f"""
+
+ROOT_CAUSE_FALLBACK = "Root cause analysis unavailable due to AI service error"
+
+# "combined" asks for root cause and explanation in one JSON response;
+# "two_call" keeps the original root cause -> explanation sequence
+REASONING_MODE = os.getenv("REASONING_MODE", "combined")
+COMBINED_TEMPERATURE = 0.1
+COMBINED_MAX_TOKENS = 160
+
+JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def build_root_cause_prompt(metrics_analysis: dict, log_analysis: dict) -> str:
+    return f"""
 You are a Site Reliability Engineer.
 
 Based ONLY on the facts below, determine the most likely root cause.
@@ -17,23 +32,174 @@ Return ONE concise sentence.
 Do NOT suggest actions.
 Do NOT speculate beyond the facts.
 
-Metrics analysis:
-{metrics_analysis}
+{render_facts(metrics_analysis, log_analysis)}
+"""
+
+
+def root_cause_cache_inputs(metrics_analysis: dict, log_analysis: dict) -> dict:
+    # What the answer actually depends on: metric statuses and which error
+    # signatures are present. Counts and first/last seen change on every run
+    # of a sustained outage and would otherwise defeat the cache.
+    return {
+        "kind": "root_cause",
+        "metrics": metrics_analysis,
+        "log_summary": log_analysis.get("summary"),
+        "errors": sorted(log_analysis.get("key_errors", []))
+    }
+
+
+def determine_root_cause(metrics_analysis: dict, log_analysis: dict) -> str:
+    prompt = build_root_cause_prompt(metrics_analysis, log_analysis)
+    cache_inputs = root_cause_cache_inputs(metrics_analysis, log_analysis)
+
+    try:
+        return complete(prompt, temperature=0.1, max_tokens=100, cache_inputs=cache_inputs)
+
+    except Exception as e:
+        return ROOT_CAUSE_FALLBACK
+
+
+async def determine_root_cause_async(metrics_analysis: dict, log_analysis: dict) -> str:
+    prompt = build_root_cause_prompt(metrics_analysis, log_analysis)
+    cache_inputs = root_cause_cache_inputs(metrics_analysis, log_analysis)
+
+    try:
+        return await acomplete(prompt, temperature=0.1, max_tokens=100, cache_inputs=cache_inputs)
+
+    except Exception:
+        return ROOT_CAUSE_FALLBACK
+
+
+# ----------------------
+# Combined Root Cause + Explanation
+# ----------------------
+# One round trip instead of two: the explanation call only re-reads the first
+# answer, so ask for both at once. A reply that doesn't parse into two
+# non-empty strings falls back to the two-call path; a failed call (timeout,
+# connection refused) is raised instead, since retrying as two calls against
+# a backend that is down only multiplies the wait.
+
+def build_combined_prompt(metrics_analysis: dict, log_analysis: dict) -> str:
+    return f"""
+You are a Site Reliability Engineer.
+
+Based ONLY on the facts below, determine the most likely root cause and
+explain it.
+Do NOT suggest actions.
+Do NOT speculate beyond the facts.
+
+Respond with ONLY a JSON object, no other text:
+{{"root_cause": "<one concise sentence>", "explanation": "<one concise sentence>"}}
 
-Log analysis:
-{log_analysis}
+{render_facts(metrics_analysis, log_analysis)}
 """
 
+
+def parse_combined_response(text: str) -> Optional[tuple[str, str]]:
+    # Models often wrap JSON in prose or code fences; take the outermost object
+    match = JSON_OBJECT_RE.search(text or "")
+    if match is None:
+        return None
     try:
-        completion = client.chat.completions.create(
-            model="meta-llama/llama-3.3-70b-instruct:free",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.1,
-            max_tokens=100,
-            timeout=10
-        )
+        data = json.loads(match.group(0))
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
 
-        return completion.choices[0].message.content.strip()
+    root_cause = data.get("root_cause")
+    explanation = data.get("explanation")
+    if not isinstance(root_cause, str) or not isinstance(explanation, str):
+        return None
+    if not root_cause.strip() or not explanation.strip():
+        return None
+    return root_cause.strip(), explanation.strip()
 
-    except Exception as e:
-        return "Root cause analysis unavailable due to AI service error"
+
+def is_valid_combined_response(text: str) -> bool:
+    return parse_combined_response(text) is not None
+
+
+def combined_cache_inputs(metrics_analysis: dict, log_analysis: dict) -> dict:
+    return {**root_cause_cache_inputs(metrics_analysis, log_analysis), "kind": "root_cause_explanation"}
+
+
+def combined_root_cause(metrics_analysis: dict, log_analysis: dict) -> Optional[tuple[str, str]]:
+    # None when the reply doesn't parse; call errors propagate
+    return parse_combined_response(complete(
+        build_combined_prompt(metrics_analysis, log_analysis),
+        temperature=COMBINED_TEMPERATURE,
+        max_tokens=COMBINED_MAX_TOKENS,
+        cache_inputs=combined_cache_inputs(metrics_analysis, log_analysis),
+        cache_if=is_valid_combined_response
+    ))
+
+
+async def combined_root_cause_async(metrics_analysis: dict, log_analysis: dict) -> Optional[tuple[str, str]]:
+    return parse_combined_response(await acomplete(
+        build_combined_prompt(metrics_analysis, log_analysis),
+        temperature=COMBINED_TEMPERATURE,
+        max_tokens=COMBINED_MAX_TOKENS,
+        cache_inputs=combined_cache_inputs(metrics_analysis, log_analysis),
+        cache_if=is_valid_combined_response
+    ))
+
+
+def determine_root_cause_and_explanation(metrics_analysis: dict, log_analysis: dict) -> tuple[str, str]:
+    if REASONING_MODE == "combined":
+        parsed = combined_root_cause(metrics_analysis, log_analysis)
+        if parsed is not None:
+            return parsed
+
+    # No point explaining the error placeholder
+    root_cause = determine_root_cause(metrics_analysis, log_analysis)
+    if root_cause == ROOT_CAUSE_FALLBACK:
+        return root_cause, EXPLANATION_FALLBACK
+    return root_cause, generate_shared_explanation(root_cause)
+
+
+async def determine_root_cause_and_explanation_async(metrics_analysis: dict, log_analysis: dict) -> tuple[str, str]:
+    if REASONING_MODE == "combined":
+        parsed = await combined_root_cause_async(metrics_analysis, log_analysis)
+        if parsed is not None:
+            return parsed
+
+    root_cause = await determine_root_cause_async(metrics_analysis, log_analysis)
+    if root_cause == ROOT_CAUSE_FALLBACK:
+        return root_cause, EXPLANATION_FALLBACK
+    return root_cause, await generate_shared_explanation_async(root_cause)
+
+
+# ----------------------
+# Rules First, LLM Second
+# ----------------------
+# A confident rule answers without any LLM call. Otherwise the LLM decides,
+# and if it can't be reached the best rule is used instead of the error
+# placeholder, but only when it clearly leads and the logs back it up.
+
+def root_cause_resolution(root_cause: str, explanation: str, source: str, confidence: Optional[float]) -> dict:
+    return {
+        "root_cause": root_cause,
+        "explanation": explanation,
+        "root_cause_source": source,
+        "root_cause_confidence": confidence
+    }
+
+
+def settle_root_cause(rule: Optional[dict], root_cause: str, explanation: str) -> dict:
+    # Combines an LLM answer with the rule result it was escalated from
+    if root_cause == ROOT_CAUSE_FALLBACK and rule is not None and rule["fallback"]:
+        return root_cause_resolution(rule["root_cause"], rule["explanation"], "rules_fallback", rule["confidence"])
+    return root_cause_resolution(root_cause, explanation, "llm", None)
+
+
+def resolve_root_cause(snapshot: dict, metrics_analysis: dict, log_analysis: dict) -> dict:
+    rule = evaluate_rules(snapshot, log_analysis)
+    if rule is not None and rule["confident"]:
+        return root_cause_resolution(rule["root_cause"], rule["explanation"], "rules", rule["confidence"])
+
+    try:
+        root_cause, explanation = determine_root_cause_and_explanation(metrics_analysis, log_analysis)
+    except Exception:
+        root_cause, explanation = ROOT_CAUSE_FALLBACK, EXPLANATION_FALLBACK
+    return settle_root_cause(rule, root_cause, explanation)
@@ -0,0 +1,203 @@
+# reasoning/rule_engine.py
+
+import os
+import re
+from typing import Optional
+
+from detection.incident_detector import SEVERITY_SCORE, symptom_name
+
+# ----------------------
+# Thresholds
+# ----------------------
+
+RULE_CONFIDENCE_THRESHOLD = float(os.getenv("RULE_CONFIDENCE_THRESHOLD", 0.75))
+AMBIGUITY_MARGIN = 0.10   # runner-up this close to the best rule -> ask the LLM
+
+METRIC_WEIGHT = 0.6
+LOG_WEIGHT = 0.4
+
+SEVERITY_WEIGHT = {
+    "CRITICAL": 1.0,
+    "HIGH": 0.85,
+    "MEDIUM": 0.5,
+    "LOW": 0.2
+}
+
+# ----------------------
+# Rules
+# ----------------------
+# Each rule names the snapshot metrics that indicate a cause and the words
+# its errors show up with in the logs. Metrics alone top out at
+# METRIC_WEIGHT, below the threshold, so a rule only answers on its own when
+# the logs agree with the metrics.
+
+RULES = [
+    {
+        "name": "database_connection_pool",
+        "metrics": ["database.connection_pool_usage_percent", "database.query_timeout_rate_percent"],
+        "log_keywords": ["db", "database", "sql", "jdbc", "query", "connection pool", "pool exhausted"],
+        "root_cause": "Database connection pool saturation is causing query timeouts and failed requests.",
+        "log_evidence": "database errors"
+    },
+    {
+        "name": "cache_degradation",
+        "metrics": ["cache.cache_hit_ratio_percent"],
+        "log_keywords": ["cache", "redis", "memcached", "eviction", "cache miss"],
+        "root_cause": "A degraded cache hit ratio is pushing load onto backing services.",
+        "log_evidence": "errors from the cache layer"
+    },
+    {
+        "name": "memory_pressure",
+        "metrics": ["compute.memory_percent", "compute.gc_pause_time_ms"],
+        "log_keywords": ["oom", "out of memory", "outofmemoryerror", "heap", "gc", "garbage collection"],
+        "root_cause": "Memory pressure is causing long garbage collection pauses and stalled requests.",
+        "log_evidence": "memory or GC errors"
+    },
+    {
+        "name": "cpu_saturation",
+        "metrics": ["compute.cpu_percent", "latency.latency_ms_p95"],
+        "log_keywords": ["cpu", "throttled", "throttling"],
+        "root_cause": "CPU saturation is slowing request processing.",
+        "log_evidence": "CPU throttling"
+    },
+    {
+        "name": "thread_pool_exhaustion",
+        "metrics": ["runtime.thread_pool_queue_depth"],
+        "log_keywords": ["thread pool", "executor", "rejected", "queue full", "worker pool"],
+        "root_cause": "Thread pool exhaustion is queueing and rejecting requests.",
+        "log_evidence": "rejected or queued work"
+    },
+    {
+        "name": "storage_io",
+        "metrics": ["storage.disk_io_utilization_percent"],
+        "log_keywords": ["disk", "i/o", "io error", "filesystem", "no space left"],
+        "root_cause": "Disk I/O saturation is slowing storage-bound operations.",
+        "log_evidence": "disk or filesystem errors"
+    },
+    {
+        "name": "network_degradation",
+        "metrics": ["network.network_latency_ms"],
+        "log_keywords": ["network", "dns", "unreachable", "connection reset", "connection refused", "socket"],
+        "root_cause": "Network degradation between services is delaying and failing requests.",
+        "log_evidence": "connection-level failures"
+    },
+    {
+        "name": "upstream_failure",
+        "metrics": ["traffic.http_5xx_error_count", "traffic.error_rate_percent"],
+        "log_keywords": ["upstream", "downstream", "bad gateway", "502", "503", "504", "circuit breaker"],
+        "root_cause": "A failing upstream dependency is returning errors that propagate to clients.",
+        "log_evidence": "failed calls to upstream services"
+    },
+    {
+        "name": "traffic_surge",
+        "metrics": ["traffic.request_count_per_min", "latency.latency_ms_p99"],
+        "log_keywords": ["rate limit", "too many requests", "429", "overloaded"],
+        "root_cause": "A surge in request volume is overloading the service.",
+        "log_evidence": "rate limiting or overload"
+    }
+]
+
+
+def _keyword_regex(keywords: list[str]) -> re.Pattern:
+    alternatives = sorted(keywords, key=len, reverse=True)
+    return re.compile(r"(?<!\w)(?:" + "|".join(map(re.escape, alternatives)) + r")(?!\w)", re.IGNORECASE)
+
+
+COMPILED_RULES = [{**rule, "log_regex": _keyword_regex(rule["log_keywords"])} for rule in RULES]
+
+# ----------------------
+# Facts
+# ----------------------
+
+def metric_severities(snapshot: dict) -> dict[str, str]:
+    # {"database.connection_pool_usage_percent": "HIGH", ...}
+    severities = {}
+
+    def walk(obj, prefix=""):
+        for k, v in obj.items():
+            if isinstance(v, dict) and "severity" in v:
+                severities[prefix + k] = v["severity"]
+            elif isinstance(v, dict):
+                walk(v, prefix=f"{prefix}{k}.")
+
+    walk(snapshot)
+    return severities
+
+
+def error_counts(log_analysis: dict) -> dict[str, int]:
+    signatures = log_analysis.get("error_signatures")
+    if signatures:
+        return {s["template"]: s["count"] for s in signatures}
+    counts: dict[str, int] = {}
+    for err in log_analysis.get("key_errors", []):
+        counts[err] = counts.get(err, 0) + 1
+    return counts
+
+
+# ----------------------
+# Evaluation
+# ----------------------
+
+def rule_evidence(rule: dict, severities: dict[str, str], errors: dict[str, int]) -> dict:
+    metric_score = sum(SEVERITY_WEIGHT.get(severities.get(m), 0.0) for m in rule["metrics"]) / len(rule["metrics"])
+
+    # Share of error lines that mention the rule's keywords; half or more
+    # counts as full agreement
+    total = sum(errors.values())
+    matched = sum(count for err, count in errors.items() if rule["log_regex"].search(err))
+    log_score = min(1.0, 2 * matched / total) if total else 0.0
+
+    return {
+        "score": round(METRIC_WEIGHT * metric_score + LOG_WEIGHT * log_score, 3),
+        "log_score": log_score,
+        "elevated": [m for m in rule["metrics"] if SEVERITY_SCORE.get(severities.get(m), 0) >= SEVERITY_SCORE["MEDIUM"]],
+        "severities": severities,
+        "matched": matched,
+        "total": total
+    }
+
+
+def explain_rule(rule: dict, evidence: dict) -> str:
+    # Only what actually matched: the rule's metrics that are elevated and,
+    # when any error lines agree, how many
+    clauses = [f"{symptom_name(m)} is {evidence['severities'][m]}" for m in evidence["elevated"]]
+    if evidence["log_score"] > 0:
+        clauses.append(
+            f"the logs report {rule['log_evidence']} ({evidence['matched']} of {evidence['total']} error lines)"
+        )
+    if not clauses:
+        return ""
+    text = ", ".join(clauses[:-1]) + " and " + clauses[-1] if len(clauses) > 1 else clauses[0]
+    return text[0].upper() + text[1:] + "."
+
+
+def evaluate_rules(snapshot: dict, log_analysis: dict) -> Optional[dict]:
+    # Best matching rule as {rule, root_cause, explanation, confidence,
+    # confident, fallback}, or None if no rule scores at all. confident is
+    # False below the threshold or when another rule scores within
+    # AMBIGUITY_MARGIN. fallback says whether the rule may stand in for an
+    # unreachable LLM: it needs the same clear lead and some support from the
+    # logs, otherwise a tie broken by list order would be reported as a cause.
+    severities = metric_severities(snapshot)
+    errors = error_counts(log_analysis)
+
+    scored = sorted(
+        ((rule_evidence(rule, severities, errors), i) for i, rule in enumerate(COMPILED_RULES)),
+        key=lambda s: (-s[0]["score"], s[1])
+    )
+    evidence, best = scored[0]
+    best_score = evidence["score"]
+    if best_score <= 0:
+        return None
+
+    runner_up = scored[1][0]["score"] if len(scored) > 1 else 0.0
+    clear_lead = best_score - runner_up >= AMBIGUITY_MARGIN
+    rule = COMPILED_RULES[best]
+    return {
+        "rule": rule["name"],
+        "root_cause": rule["root_cause"],
+        "explanation": explain_rule(rule, evidence),
+        "confidence": best_score,
+        "confident": best_score >= RULE_CONFIDENCE_THRESHOLD and clear_lead,
+        "fallback": clear_lead and evidence["log_score"] > 0
+    }
@@ -0,0 +1,94 @@
+# reasoning/stub_server.py
+#
+# OpenAI-compatible /v1/chat/completions endpoint that answers with the
+# deterministic stub, for exercising the "local" backend (and its HTTP path)
+# without a model:
+#
+#   python -m reasoning.stub_server --port 8080 --latency 0.2
+#   LLM_BACKENDS=local python -m workflows.run_workflow
+
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from uuid import uuid4
+
+from reasoning.backends import STUB_MODEL, stub_answer
+
+
+def completion_response(text: str, model: str) -> dict:
+    return {
+        "id": f"chatcmpl-{uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": text},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+
+    def _send_json(self, status: int, body: dict):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": STUB_MODEL, "object": "model"}]})
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            prompt = "\n".join(m.get("content", "") for m in request["messages"])
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {"error": {"message": f"Bad request: {e}"}})
+            return
+
+        if self.latency:
+            time.sleep(self.latency)
+        self._send_json(200, completion_response(stub_answer(prompt), request.get("model", STUB_MODEL)))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host: str = "127.0.0.1", port: int = 8080, latency: float = 0.0) -> ThreadingHTTPServer:
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"latency": latency})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each answer")
+    args = parser.parse_args()
+
+    server = serve(args.host, args.port, args.latency)
+    print(f"Stub LLM listening on http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
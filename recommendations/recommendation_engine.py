@@ -1,48 +1,27 @@
 # recommendations/recommendation_engine.py
 
 from typing import List, Dict
-from reasoning.root_cause_ai import client
+from reasoning.llm_client import acomplete, complete
+from recommendations.taxonomy import UNKNOWN_CATEGORY, build_matcher, load_taxonomy
+
+EXPLANATION_FALLBACK = "Explanation unavailable due to AI service error"
 
 # ----------------------
 # Allowed Actions (Deterministic)
 # ----------------------
+# Categories, their keywords and their actions come from taxonomy.json; the
+# keyword matcher is compiled once at import.
 
-ALLOWED_ACTIONS = {
-    "database_connectivity": [
-        {
-            "action": "Check database connection pool saturation",
-            "type": "INVESTIGATE",
-            "base_confidence": 0.85
-        },
-        {
-            "action": "Verify database network connectivity",
-            "type": "INVESTIGATE",
-            "base_confidence": 0.80
-        },
-        {
-            "action": "Scale database read replicas",
-            "type": "MITIGATE",
-            "base_confidence": 0.65
-        }
-    ],
-    "unknown": [
-        {
-            "action": "Collect additional metrics and logs",
-            "type": "INVESTIGATE",
-            "base_confidence": 0.50
-        }
-    ]
-}
+TAXONOMY = load_taxonomy()
+ALLOWED_ACTIONS = {name: category["actions"] for name, category in TAXONOMY.items()}
+MATCHER = build_matcher(TAXONOMY)
 
 # ----------------------
 # Root Cause Classification
 # ----------------------
 
 def classify_root_cause(root_cause: str) -> str:
-    rc = root_cause.lower()
-    if any(k in rc for k in ["database", "db", "sql", "connection"]):
-        return "database_connectivity"
-    return "unknown"
+    return MATCHER.classify(root_cause, UNKNOWN_CATEGORY)
 
 # ----------------------
 # Confidence Adjustment
@@ -59,8 +38,8 @@ def adjust_confidence(base: float, severity: str) -> float:
 # Shared AI Explanation
 # ----------------------
 
-def generate_shared_explanation(root_cause: str) -> str:
-    prompt = f"""
+def build_explanation_prompt(root_cause: str) -> str:
+    return f"""
 You are an SRE assistant.
 
 Explain the root cause below in ONE concise sentence.
@@ -68,26 +47,40 @@ Do NOT suggest actions.
 
 Root cause: {root_cause}
 """
+
+
+def generate_shared_explanation(root_cause: str) -> str:
+    prompt = build_explanation_prompt(root_cause)
+    try:
+        return complete(prompt, temperature=0.2, max_tokens=50)
+    except Exception:
+        return EXPLANATION_FALLBACK
+
+
+async def generate_shared_explanation_async(root_cause: str) -> str:
+    prompt = build_explanation_prompt(root_cause)
     try:
-        response = client.chat.completions.create(
-            model="meta-llama/llama-3.3-70b-instruct:free",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.2,
-            max_tokens=50
-        )
-        return response.choices[0].message.content.strip()
+        return await acomplete(prompt, temperature=0.2, max_tokens=50)
     except Exception:
-        return "Explanation unavailable due to AI service error"
+        return EXPLANATION_FALLBACK
 
 # ----------------------
 # Recommendation Engine
 # ----------------------
 
 def generate_recommendations(root_cause: str, severity: str) -> List[Dict]:
-    category = classify_root_cause(root_cause)
-    actions = ALLOWED_ACTIONS.get(category, ALLOWED_ACTIONS["unknown"])
-
     explanation = generate_shared_explanation(root_cause)
+    return build_recommendations(root_cause, severity, explanation)
+
+
+async def generate_recommendations_async(root_cause: str, severity: str) -> List[Dict]:
+    explanation = await generate_shared_explanation_async(root_cause)
+    return build_recommendations(root_cause, severity, explanation)
+
+
+def build_recommendations(root_cause: str, severity: str, explanation: str) -> List[Dict]:
+    category = classify_root_cause(root_cause)
+    actions = ALLOWED_ACTIONS.get(category, ALLOWED_ACTIONS[UNKNOWN_CATEGORY])
 
     recommendations = []
 
@@ -0,0 +1,99 @@
+# recommendations/taxonomy.py
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List
+
+TAXONOMY_PATH = os.getenv("TAXONOMY_PATH", str(Path(__file__).with_name("taxonomy.json")))
+UNKNOWN_CATEGORY = "unknown"
+
+SEPARATOR_RE = re.compile(r"[\s_-]+")
+SEPARATOR_PATTERN = r"[\s_-]+"
+
+
+def normalize_keyword(text: str) -> str:
+    return SEPARATOR_RE.sub(" ", text.strip().lower())
+
+
+def _trie_pattern(keywords) -> str:
+    # Regex alternation is tried branch by branch, so a flat "a|b|c|..." costs
+    # one attempt per keyword at every position. Factoring shared prefixes
+    # into a trie ("data(?:base|dog)") keeps each position to one pass down
+    # the tree.
+    trie: dict = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    return _emit(trie)
+
+
+def _emit(node: dict) -> str:
+    branches = [
+        (SEPARATOR_PATTERN if ch == " " else re.escape(ch)) + _emit(child)
+        for ch, child in sorted(node.items()) if ch
+    ]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        # A keyword ends here; the greedy "?" still tries the longer ones first
+        body = f"(?:{body})?" if len(branches) == 1 else body + "?"
+    return body
+
+
+class KeywordMatcher:
+    # All keywords of all categories compiled into one trie-shaped regex, so a
+    # root cause is scanned once however many keywords there are.
+    # Keywords only match as whole words, and spaces inside a keyword also
+    # match "_" and "-" ("connection_pool", "connection-pool").
+    # Each distinct keyword found adds its weight to every category listing
+    # it; the highest score wins, ties going to the category listed first.
+    # Spellings of one keyword ("third party", "third-party") count once per
+    # category, at the highest weight given.
+
+    def __init__(self, categories: Dict[str, Dict[str, float]]):
+        self.order = {name: i for i, name in enumerate(categories)}
+        merged: Dict[str, Dict[str, float]] = {}
+        for name, keywords in categories.items():
+            for keyword, weight in keywords.items():
+                category_weights = merged.setdefault(normalize_keyword(keyword), {})
+                category_weights[name] = max(weight, category_weights.get(name, weight))
+        self.weights: Dict[str, List[tuple]] = {k: list(v.items()) for k, v in merged.items()}
+
+        self.regex = None
+        if self.weights:
+            self.regex = re.compile(rf"(?<!\w){_trie_pattern(self.weights)}(?!\w)", re.IGNORECASE)
+
+    def scores(self, text: str) -> Dict[str, float]:
+        if self.regex is None:
+            return {}
+        scores: Dict[str, float] = {}
+        for match in {m.lower() for m in self.regex.findall(text)}:
+            # Only keywords written with "_" or "-" need normalizing
+            hits = self.weights.get(match) or self.weights.get(normalize_keyword(match), ())
+            for name, weight in hits:
+                scores[name] = scores.get(name, 0) + weight
+        return scores
+
+    def classify(self, text: str, default: str = UNKNOWN_CATEGORY) -> str:
+        scores = self.scores(text)
+        if not scores:
+            return default
+        return max(scores, key=lambda name: (scores[name], -self.order[name]))
+
+
+def load_taxonomy(path: str = TAXONOMY_PATH) -> dict:
+    with open(path) as f:
+        taxonomy = json.load(f)
+    categories = taxonomy["categories"]
+    if UNKNOWN_CATEGORY not in categories:
+        raise ValueError(f"Taxonomy {path} has no '{UNKNOWN_CATEGORY}' category")
+    return categories
+
+
+def build_matcher(categories: dict) -> KeywordMatcher:
+    return KeywordMatcher({name: c.get("keywords", {}) for name, c in categories.items()})
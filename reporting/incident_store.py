@@ -0,0 +1,296 @@
+# reporting/incident_store.py
+
+import heapq
+import itertools
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+INCIDENT_DB_PATH = os.getenv("INCIDENT_DB_PATH", "reports/incidents.sqlite3")
+LEGACY_INDEX_PATH = "reports/index.json"
+
+COLUMNS = ["incident_id", "service", "severity", "detected_at", "md_path", "pdf_path", "pdf_status"]
+
+# pdf_status values; NULL for entries indexed before PDFs were rendered in
+# the background
+PDF_PENDING = "pending"
+PDF_DONE = "done"
+PDF_FAILED = "failed"
+
+
+class IncidentStore:
+    # Incident index in SQLite (WAL, so the dashboard can read while
+    # workflows write, and concurrent runs don't lose each other's entries).
+    # Each incident is one row insert instead of rewriting the whole index;
+    # lookups by id, service, severity and time use indexes.
+    # detected_at is the ISO-8601 string from the detector, which sorts
+    # chronologically as text.
+
+    def __init__(self, path: str = INCIDENT_DB_PATH, legacy_index: Optional[str] = LEGACY_INDEX_PATH):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS incidents ("
+            " incident_id TEXT PRIMARY KEY,"
+            " service TEXT NOT NULL,"
+            " severity TEXT NOT NULL,"
+            " detected_at TEXT NOT NULL,"
+            " md_path TEXT,"
+            " pdf_path TEXT,"
+            " pdf_status TEXT,"
+            " pdf_error TEXT)"
+        )
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(incidents)")}
+        for column in ("pdf_status", "pdf_error"):
+            if column not in existing:
+                self.conn.execute(f"ALTER TABLE incidents ADD COLUMN {column} TEXT")
+        # Each index ends in (detected_at, incident_id), the listing order, so
+        # a filtered page is an index range read with no sort
+        for old_index in ("incidents_service", "incidents_severity", "incidents_detected_at"):
+            self.conn.execute(f"DROP INDEX IF EXISTS {old_index}")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS incidents_recent ON incidents (detected_at, incident_id)")
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS incidents_service_recent ON incidents (service, detected_at, incident_id)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS incidents_severity_recent ON incidents (severity, detected_at, incident_id)"
+        )
+
+        # Incident counts per day, service and severity, kept in step with
+        # every write so charts never scan the incident history
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS incident_rollups ("
+            " day TEXT NOT NULL,"
+            " service TEXT NOT NULL,"
+            " severity TEXT NOT NULL,"
+            " count INTEGER NOT NULL,"
+            " PRIMARY KEY (day, service, severity))"
+        )
+        # Covers the dashboard's per-day severity totals, so summing over
+        # services reads the index in order instead of sorting the table
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS incident_rollups_day_severity ON incident_rollups (day, severity, count)"
+        )
+
+        if legacy_index and Path(legacy_index).exists() and self.count() == 0:
+            self.import_legacy_index(legacy_index)
+        elif self.count() and not self.conn.execute("SELECT 1 FROM incident_rollups LIMIT 1").fetchone():
+            self.rebuild_rollups()
+
+    def _bump(self, day: str, service: str, severity: str, delta: int):
+        self.conn.execute(
+            "INSERT INTO incident_rollups (day, service, severity, count) VALUES (?, ?, ?, ?)"
+            " ON CONFLICT (day, service, severity) DO UPDATE SET count = count + excluded.count",
+            (day, service, severity, delta)
+        )
+
+    def _write(self, entry: dict):
+        # Caller holds the lock and an open transaction. Re-indexing an
+        # incident moves its rollup count rather than adding a second one.
+        old = self.conn.execute(
+            "SELECT detected_at, service, severity FROM incidents WHERE incident_id = ?",
+            (entry["incident_id"],)
+        ).fetchone()
+        if old is not None:
+            self._bump(old["detected_at"][:10], old["service"], old["severity"], -1)
+
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO incidents ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+            [entry.get(c) for c in COLUMNS]
+        )
+        self._bump(entry["detected_at"][:10], entry["service"], entry["severity"], 1)
+
+    def add(self, entry: dict):
+        self.add_many([entry])
+
+    def add_many(self, entries: Iterable[dict]):
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                for entry in entries:
+                    self._write(entry)
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def rebuild_rollups(self):
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.execute("DELETE FROM incident_rollups")
+            self.conn.execute(
+                "INSERT INTO incident_rollups (day, service, severity, count)"
+                " SELECT substr(detected_at, 1, 10), service, severity, COUNT(*)"
+                " FROM incidents GROUP BY 1, 2, 3"
+            )
+            self.conn.execute("COMMIT")
+
+    def import_legacy_index(self, path: str = LEGACY_INDEX_PATH) -> int:
+        # One-off migration from the old rewrite-the-whole-file index.json
+        with open(path) as f:
+            entries = json.load(f)
+        self.add_many(entries)
+        return len(entries)
+
+    def set_pdf_status(self, incident_id: str, status: str, error: Optional[str] = None):
+        with self._lock:
+            self.conn.execute(
+                "UPDATE incidents SET pdf_status = ?, pdf_error = ? WHERE incident_id = ?",
+                (status, error, incident_id)
+            )
+
+    def get(self, incident_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM incidents WHERE incident_id = ?", (incident_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def _where(
+        self,
+        service: Optional[str] = None,
+        severity: Union[str, Iterable[str], None] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        id_prefix: Optional[str] = None
+    ) -> tuple[str, list]:
+        # Every predicate maps onto an index: the primary key for id_prefix
+        # (as a range, so no LIKE scan), the (x, detected_at) indexes for the
+        # rest. since/until are inclusive ISO-8601 bounds on detected_at.
+        clauses, params = [], []
+        if service is not None:
+            clauses.append("service = ?")
+            params.append(service)
+        if severity is not None:
+            severities = [severity] if isinstance(severity, str) else list(severity)
+            clauses.append(f"severity IN ({', '.join('?' * len(severities))})")
+            params.extend(severities)
+        if since is not None:
+            clauses.append("detected_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("detected_at <= ?")
+            params.append(until)
+        if id_prefix:
+            clauses.append("incident_id >= ? AND incident_id < ?")
+            params += [id_prefix, id_prefix[:-1] + chr(ord(id_prefix[-1]) + 1)]
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(
+        self,
+        service: Optional[str] = None,
+        severity: Union[str, Iterable[str], None] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        id_prefix: Optional[str] = None,
+        after: Optional[tuple[str, str]] = None,
+        limit: Optional[int] = None
+    ) -> list[dict]:
+        # Newest first, ties broken by incident_id. For paging, pass the
+        # (detected_at, incident_id) of the last row seen as after: each page
+        # then starts with an index seek, however deep it is.
+        if limit is not None and severity is not None and not isinstance(severity, str):
+            # SQLite sorts the whole match for "severity IN (...) ORDER BY";
+            # one ordered, limited read per severity merged here stays
+            # O(severities x limit)
+            parts = [
+                self.query(service, value, since, until, id_prefix, after, limit)
+                for value in dict.fromkeys(severity)
+            ]
+            merged = heapq.merge(*parts, key=lambda r: (r["detected_at"], r["incident_id"]), reverse=True)
+            return list(itertools.islice(merged, limit))
+
+        where, params = self._where(service, severity, since, until, id_prefix)
+        if after is not None:
+            where += (" AND " if where else " WHERE ") + "(detected_at, incident_id) < (?, ?)"
+            params += list(after)
+
+        sql = f"SELECT * FROM incidents{where} ORDER BY detected_at DESC, incident_id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def page(self, page_size: int, after: Optional[tuple[str, str]] = None, **filters) -> tuple[list[dict], Optional[tuple[str, str]]]:
+        # One page plus the cursor for the next one (None on the last page)
+        rows = self.query(after=after, limit=page_size + 1, **filters)
+        if len(rows) <= page_size:
+            return rows, None
+        rows = rows[:page_size]
+        return rows, (rows[-1]["detected_at"], rows[-1]["incident_id"])
+
+    def daily_counts(self, **filters) -> list[dict]:
+        # [{"day", "severity", "count"}] over the incidents matching filters
+        where, params = self._where(**filters)
+        sql = (
+            "SELECT substr(detected_at, 1, 10) AS day, severity, COUNT(*) AS count"
+            f" FROM incidents{where} GROUP BY 1, 2 ORDER BY 1"
+        )
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def daily_rollups(
+        self,
+        severity: Union[str, Iterable[str], None] = None,
+        since_day: Optional[str] = None
+    ) -> list[dict]:
+        # [{"day": "2026-01-17", "severity": ..., "count": n}] summed over
+        # services, from the rollups rather than the incident history
+        clauses, params = ["count > 0"], []
+        if severity is not None:
+            severities = [severity] if isinstance(severity, str) else list(severity)
+            clauses.append(f"severity IN ({', '.join('?' * len(severities))})")
+            params.extend(severities)
+        if since_day is not None:
+            clauses.append("day >= ?")
+            params.append(since_day)
+        sql = (
+            "SELECT day, severity, SUM(count) AS count FROM incident_rollups"
+            f" WHERE {' AND '.join(clauses)} GROUP BY day, severity ORDER BY day"
+        )
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def data_stamp(self) -> tuple:
+        # Changes whenever any process writes (WAL appends bump the -wal
+        # file's mtime/size); the dashboard uses it to invalidate its caches
+        stamp = []
+        for suffix in ("", "-wal"):
+            try:
+                st = os.stat(self.path + suffix)
+                stamp += [st.st_mtime_ns, st.st_size]
+            except FileNotFoundError:
+                stamp += [0, 0]
+        return tuple(stamp)
+
+    def count(self, **filters) -> int:
+        where, params = self._where(**filters)
+        with self._lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM incidents{where}", params).fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+_store: Optional[IncidentStore] = None
+_store_pid: Optional[int] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> IncidentStore:
+    # One connection per process (SQLite connections must not cross a fork)
+    global _store, _store_pid
+    with _store_lock:
+        if _store is None or _store_pid != os.getpid():
+            _store = IncidentStore()
+            _store_pid = os.getpid()
+        return _store
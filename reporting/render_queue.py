@@ -0,0 +1,77 @@
+# reporting/render_queue.py
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Optional
+
+from reporting.incident_store import PDF_DONE, PDF_FAILED, get_store
+from reporting.report_generator import markdown_to_pdf
+
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", 2))
+# RENDER_PDF_ASYNC=0 renders inside report_node as before
+RENDER_PDF_ASYNC = os.getenv("RENDER_PDF_ASYNC", "1") != "0"
+
+
+def render_pdf(md_text: str, pdf_path: str, incident_id: str):
+    # Renders and records the outcome in the incident index
+    try:
+        markdown_to_pdf(md_text, pdf_path)
+    except Exception as e:
+        get_store().set_pdf_status(incident_id, PDF_FAILED, f"{type(e).__name__}: {e}")
+        raise
+    get_store().set_pdf_status(incident_id, PDF_DONE)
+
+
+class RenderQueue:
+    # PDF layout off the incident's critical path: report_node writes the
+    # markdown, indexes the incident as pending and returns; workers render
+    # the PDF and flip the status. Threads rather than processes so status
+    # updates share the store connection and nothing is pickled.
+
+    def __init__(self, max_workers: int = RENDER_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pdf-render")
+        self._pending: set[Future] = set()
+        self._lock = threading.Lock()
+
+    def submit(self, md_text: str, pdf_path: str, incident_id: str) -> Future:
+        future = self.executor.submit(render_pdf, md_text, pdf_path, incident_id)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._discard)
+        return future
+
+    def _discard(self, future: Future):
+        with self._lock:
+            self._pending.discard(future)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        # Waits for everything queued so far; True if it all finished
+        with self._lock:
+            pending = list(self._pending)
+        _, not_done = wait(pending, timeout=timeout)
+        return not not_done
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+_queue: Optional[RenderQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_render_queue() -> RenderQueue:
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = RenderQueue()
+        return _queue
+
+
+def drain_render_queue(timeout: Optional[float] = None) -> bool:
+    # Call before a script exits so queued PDFs are written
+    return _queue.drain(timeout) if _queue is not None else True
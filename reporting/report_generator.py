@@ -1,5 +1,7 @@
+import threading
 from datetime import datetime
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_LEFT
@@ -35,14 +37,28 @@ def generate_markdown_report(state: Dict[str, Any]) -> str:
     lines.append("## Log Analysis")
     lines.append(f"- **Error Count:** {logs['error_count']}")
     lines.append(f"- **Warning Count:** {logs['warning_count']}")
-    lines.append("- **Key Errors:**")
-    for err in logs["key_errors"]:
-        lines.append(f"  - {err}")
+    signatures = logs.get("error_signatures")
+    if signatures:
+        lines.append("- **Error Signatures:**")
+        for sig in signatures:
+            seen = ""
+            if sig.get("first_seen"):
+                seen = f", first seen {sig['first_seen']}, last seen {sig['last_seen']}"
+            lines.append(f"  - {sig['template']} (x{sig['count']}{seen})")
+    else:
+        lines.append("- **Key Errors:**")
+        for err in logs["key_errors"]:
+            lines.append(f"  - {err}")
     lines.append("")
 
     # Root Cause
     lines.append("## Root Cause")
     lines.append(state["root_cause"])
+    source = state.get("root_cause_source")
+    if source:
+        confidence = state.get("root_cause_confidence")
+        detail = f" (confidence: {confidence})" if confidence is not None else ""
+        lines.append(f"\n_Source: {source}{detail}_")
     lines.append("")
 
     # Recommendations
@@ -66,82 +82,136 @@ def save_markdown(md: str, path: str):
 
 
 
-def markdown_to_pdf(md_text: str, pdf_path: str):
+# ----------------------
+# PDF Rendering
+# ----------------------
+
+def build_report_styles() -> dict:
     styles = getSampleStyleSheet()
 
-    # Custom styles
-    title_style = ParagraphStyle(
-        "TitleStyle",
-        parent=styles["Heading1"],
-        fontSize=18,
-        spaceAfter=16,
-        alignment=TA_LEFT
-    )
-
-    heading_style = ParagraphStyle(
-        "HeadingStyle",
-        parent=styles["Heading2"],
-        fontSize=14,
-        spaceBefore=14,
-        spaceAfter=8
-    )
-
-    body_style = ParagraphStyle(
-        "BodyStyle",
-        parent=styles["Normal"],
-        fontSize=10,
-        spaceAfter=6
-    )
-
-    italic_style = ParagraphStyle(
-        "ItalicStyle",
-        parent=styles["Normal"],
-        fontSize=9,
-        spaceAfter=8,
-        fontName="Helvetica-Oblique"
-    )
-
-    doc = SimpleDocTemplate(
-        pdf_path,
-        pagesize=A4,
-        rightMargin=40,
-        leftMargin=40,
-        topMargin=40,
-        bottomMargin=40
-    )
-
-    story = []
-
-    for line in md_text.split("\n"):
-        line = line.strip()
-
-        if not line:
-            story.append(Spacer(1, 10))
-            continue
-
-        # Title
-        if line.startswith("# "):
-            story.append(Paragraph(line.replace("# ", ""), title_style))
-
-        # Section headers
-        elif line.startswith("## "):
-            story.append(Spacer(1, 12))
-            story.append(Paragraph(line.replace("## ", ""), heading_style))
-
-        # Bullet points
-        elif line.startswith("- "):
-            story.append(
-                Paragraph("• " + line.replace("- ", ""), body_style)
-            )
-
-        # Italic notes
-        elif line.startswith("_") and line.endswith("_"):
-            story.append(
-                Paragraph(line.strip("_"), italic_style)
-            )
-
-        # Normal text
-        else:
-            story.append(Paragraph(line, body_style))
-
-    doc.build(story)
+    return {
+        "title": ParagraphStyle(
+            "TitleStyle",
+            parent=styles["Heading1"],
+            fontSize=18,
+            spaceAfter=16,
+            alignment=TA_LEFT
+        ),
+        "heading": ParagraphStyle(
+            "HeadingStyle",
+            parent=styles["Heading2"],
+            fontSize=14,
+            spaceBefore=14,
+            spaceAfter=8
+        ),
+        "body": ParagraphStyle(
+            "BodyStyle",
+            parent=styles["Normal"],
+            fontSize=10,
+            spaceAfter=6
+        ),
+        "italic": ParagraphStyle(
+            "ItalicStyle",
+            parent=styles["Normal"],
+            fontSize=9,
+            spaceAfter=8,
+            fontName="Helvetica-Oblique"
+        )
+    }
+
+
+def parse_markdown_line(line: str) -> Optional[Tuple[str, str]]:
+    # (style, text) for one stripped line, or None for a blank line
+    if not line:
+        return None
+
+    # Title
+    if line.startswith("# "):
+        return "title", line.replace("# ", "")
+
+    # Section headers
+    if line.startswith("## "):
+        return "heading", line.replace("## ", "")
+
+    # Bullet points
+    if line.startswith("- "):
+        return "body", "• " + line.replace("- ", "")
+
+    # Italic notes
+    if line.startswith("_") and line.endswith("_"):
+        return "italic", line.strip("_")
+
+    # Normal text
+    return "body", line
+
+
+class ReportRenderer:
+    # Styles are built once per renderer, and each distinct line's parsed
+    # paragraph fragments are cached, so the headings, labels and recurring
+    # recommendation lines every report shares skip reportlab's markup
+    # parser. One renderer can render many reports (render_many) and is
+    # safe to share between threads.
+
+    def __init__(self, cache_size: int = 4096):
+        self.styles = build_report_styles()
+        self._paragraph_template = lru_cache(maxsize=cache_size)(self._parse_paragraph)
+
+    def _parse_paragraph(self, line: str):
+        parsed = parse_markdown_line(line)
+        if parsed is None:
+            return None
+        style, text = parsed
+        paragraph = Paragraph(text, self.styles[style])
+        return style, paragraph.text, paragraph.style, paragraph.bulletText, paragraph.frags
+
+    def story(self, md_text: str) -> list:
+        story = []
+
+        for line in md_text.split("\n"):
+            template = self._paragraph_template(line.strip())
+
+            if template is None:
+                story.append(Spacer(1, 10))
+                continue
+
+            style, text, para_style, bullet_text, frags = template
+            if style == "heading":
+                story.append(Spacer(1, 12))
+            story.append(Paragraph(text, para_style, bullet_text, frags=frags))
+
+        return story
+
+    def render(self, md_text: str, pdf_path: str):
+        doc = SimpleDocTemplate(
+            pdf_path,
+            pagesize=A4,
+            rightMargin=40,
+            leftMargin=40,
+            topMargin=40,
+            bottomMargin=40
+        )
+        doc.build(self.story(md_text))
+
+    def render_many(self, reports: Iterable[Tuple[str, str]]) -> int:
+        # reports: (md_text, pdf_path) pairs; returns how many were rendered
+        count = 0
+        for md_text, pdf_path in reports:
+            self.render(md_text, pdf_path)
+            count += 1
+        return count
+
+
+_renderer: Optional[ReportRenderer] = None
+_renderer_lock = threading.Lock()
+
+
+def get_renderer() -> ReportRenderer:
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = ReportRenderer()
+        return _renderer
+
+
+def markdown_to_pdf(md_text: str, pdf_path: str):
+    get_renderer().render(md_text, pdf_path)
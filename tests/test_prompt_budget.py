@@ -0,0 +1,70 @@
+# tests/test_prompt_budget.py
+#
+# The root-cause prompts must stay within the token budget however many
+# error lines the log analysis carries.
+
+import random
+
+import pytest
+
+from analysis.log_analysis import analyze_logs
+from reasoning.prompt_builder import DEFAULT_TOKEN_BUDGET, compact_facts, estimate_tokens
+from reasoning.root_cause_ai import build_combined_prompt, build_root_cause_prompt
+
+ERROR_TEMPLATES = [
+    "DB timeout after {n}ms on conn {m}",
+    "upstream 10.0.{m}.4:8080 refused request",
+    "Connection pool exhausted (active={n})",
+    "Failed to refresh token for user user{n}",
+]
+
+METRICS_ANALYSIS = {
+    "cpu_status": "HIGH",
+    "error_rate_status": "CRITICAL",
+    "latency_status": "MEDIUM",
+    "summary": "CPU: HIGH, Errors: CRITICAL, Latency: MEDIUM"
+}
+
+# Instructions around the facts section; generous, they are ~60 tokens
+PROMPT_OVERHEAD_TOKENS = 120
+
+
+def synthetic_log_analysis(count: int, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    return analyze_logs([
+        "2026-01-17T11:45:00Z ERROR "
+        + rng.choice(ERROR_TEMPLATES).format(n=rng.randint(1, 5000), m=rng.randint(1, 64))
+        for _ in range(count)
+    ])
+
+
+@pytest.fixture(scope="module")
+def log_analysis() -> dict:
+    return synthetic_log_analysis(100_000)
+
+
+def test_facts_stay_within_default_budget(log_analysis):
+    text, stats = compact_facts(METRICS_ANALYSIS, log_analysis)
+
+    assert stats["tokens"] <= DEFAULT_TOKEN_BUDGET
+    assert estimate_tokens(text) == stats["tokens"]
+    assert stats["raw_tokens"] > 10 * DEFAULT_TOKEN_BUDGET
+
+
+@pytest.mark.parametrize("budget", [128, 256, 1024])
+def test_facts_respect_custom_budget(log_analysis, budget):
+    _, stats = compact_facts(METRICS_ANALYSIS, log_analysis, budget)
+    assert stats["tokens"] <= budget
+
+
+@pytest.mark.parametrize("build_prompt", [build_root_cause_prompt, build_combined_prompt])
+def test_prompt_is_bounded(log_analysis, build_prompt):
+    prompt = build_prompt(METRICS_ANALYSIS, log_analysis)
+    assert estimate_tokens(prompt) <= DEFAULT_TOKEN_BUDGET + PROMPT_OVERHEAD_TOKENS
+
+
+def test_prompt_does_not_grow_with_error_count(log_analysis):
+    small = build_root_cause_prompt(METRICS_ANALYSIS, synthetic_log_analysis(1_000))
+    large = build_root_cause_prompt(METRICS_ANALYSIS, log_analysis)
+    assert estimate_tokens(large) <= DEFAULT_TOKEN_BUDGET + PROMPT_OVERHEAD_TOKENS
+    assert estimate_tokens(large) - estimate_tokens(small) <= DEFAULT_TOKEN_BUDGET // 4
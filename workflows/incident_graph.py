@@ -1,12 +1,15 @@
-from langgraph.graph import StateGraph, END
-import json
+from langgraph.graph import StateGraph, START, END
 from pathlib import Path
 
+from observability.tracing import traced
 from workflows.state import IncidentState
 from analysis.metrics_analysis import analyze_metrics
-from analysis.log_analysis import analyze_logs
-from reasoning.root_cause_ai import determine_root_cause
-from recommendations.recommendation_engine import generate_recommendations
+from analysis.log_ingestion import find_log_files
+from analysis.log_tail import tail_logs
+from reasoning.root_cause_ai import resolve_root_cause
+from recommendations.recommendation_engine import build_recommendations, generate_recommendations
+from reporting.incident_store import PDF_DONE, PDF_PENDING, get_store
+from reporting.render_queue import RENDER_PDF_ASYNC, get_render_queue
 from reporting.report_generator import (
     generate_markdown_report,
     save_markdown,
@@ -17,41 +20,45 @@ from reporting.report_generator import (
 # ----------------------
 # Workflow Nodes
 # ----------------------
+# Nodes return only the keys they produce; LangGraph merges them into the
+# state, which lets the metrics and log branches run in the same step.
 
-def metrics_node(state: IncidentState) -> IncidentState:
+def metrics_node(state: IncidentState) -> dict:
     metrics = state["incident"]["metrics_snapshot"]
-    state["metrics_analysis"] = analyze_metrics(metrics)
-    return state
+    return {"metrics_analysis": analyze_metrics(metrics)}
 
 
-def logs_node(state: IncidentState) -> IncidentState:
-    with open("data/logs/auth-service.log", "r") as f:
-        logs = f.readlines()
-    state["log_analysis"] = analyze_logs(logs)
-    return state
+def logs_node(state: IncidentState) -> dict:
+    paths = find_log_files(state["incident"]["service"])
+    return {"log_analysis": tail_logs(paths)}
 
 
-def root_cause_node(state: IncidentState) -> IncidentState:
-    state["root_cause"] = determine_root_cause(
+def root_cause_node(state: IncidentState) -> dict:
+    return resolve_root_cause(
+        state["incident"]["metrics_snapshot"],
         state["metrics_analysis"],
         state["log_analysis"]
     )
-    return state
 
 
-def recommendation_node(state: IncidentState) -> IncidentState:
-    print(">>> RECOMMENDATION NODE EXECUTED <<<")
-
-    state["recommendations"] = generate_recommendations(
-        state["root_cause"],
-        state["incident"]["severity"]
-    )
-    return state
-
+def recommendation_node(state: IncidentState) -> dict:
+    # The explanation normally arrives with the root cause; only ask for it
+    # separately when it didn't
+    if state.get("explanation"):
+        recommendations = build_recommendations(
+            state["root_cause"],
+            state["incident"]["severity"],
+            state["explanation"]
+        )
+    else:
+        recommendations = generate_recommendations(
+            state["root_cause"],
+            state["incident"]["severity"]
+        )
+    return {"recommendations": recommendations}
 
-def report_node(state: IncidentState) -> IncidentState:
-    print(">>> REPORT NODE EXECUTED <<<")
 
+def report_node(state: IncidentState) -> dict:
     reports_dir = Path("reports")
     reports_dir.mkdir(exist_ok=True)
 
@@ -59,37 +66,31 @@ def report_node(state: IncidentState) -> IncidentState:
     md_path = reports_dir / f"{incident_id}.md"
     pdf_path = reports_dir / f"{incident_id}.pdf"
 
-    # Generate report
+    # Generate report; the PDF is rendered in the background unless
+    # RENDER_PDF_ASYNC=0
     md = generate_markdown_report(state)
     save_markdown(md, md_path)
-    markdown_to_pdf(md, str(pdf_path))
-
+    if not RENDER_PDF_ASYNC:
+        markdown_to_pdf(md, str(pdf_path))
 
-    # Update state
-    state["report_markdown"] = str(md_path)
-    state["report_pdf_path"] = str(pdf_path)
-
-    # Update index.json
-    index_path = reports_dir / "index.json"
-    if index_path.exists():
-        with open(index_path, "r") as f:
-            index = json.load(f)
-    else:
-        index = []
-
-    index.append({
+    # Index the incident (one row insert, safe with concurrent runs)
+    get_store().add({
         "incident_id": incident_id,
         "service": state["incident"]["service"],
         "severity": state["incident"]["severity"],
         "detected_at": state["incident"]["detected_at"],
         "md_path": str(md_path),
-        "pdf_path": str(pdf_path)
+        "pdf_path": str(pdf_path),
+        "pdf_status": PDF_PENDING if RENDER_PDF_ASYNC else PDF_DONE
     })
 
-    with open(index_path, "w") as f:
-        json.dump(index, f, indent=2)
+    if RENDER_PDF_ASYNC:
+        get_render_queue().submit(md, str(pdf_path), incident_id)
 
-    return state
+    return {
+        "report_markdown": str(md_path),
+        "report_pdf_path": str(pdf_path)
+    }
 
 
 # ----------------------
@@ -99,16 +100,18 @@ def report_node(state: IncidentState) -> IncidentState:
 def build_incident_graph():
     graph = StateGraph(IncidentState)
 
-    graph.add_node("analyze_metrics", metrics_node)
-    graph.add_node("analyze_logs", logs_node)
-    graph.add_node("root_cause", root_cause_node)
-    graph.add_node("recommendations", recommendation_node)
-    graph.add_node("report", report_node)
-
-    graph.set_entry_point("analyze_metrics")
-
-    graph.add_edge("analyze_metrics", "analyze_logs")
-    graph.add_edge("analyze_logs", "root_cause")
+    # Each node's update carries a span with its timings and counters
+    graph.add_node("analyze_metrics", traced("analyze_metrics", metrics_node))
+    graph.add_node("analyze_logs", traced("analyze_logs", logs_node))
+    graph.add_node("root_cause", traced("root_cause", root_cause_node))
+    graph.add_node("recommendations", traced("recommendations", recommendation_node))
+    graph.add_node("report", traced("report", report_node))
+
+    # Metrics and log analysis are independent: fan out from START and join
+    # before root cause, so incident latency is the slower of the two
+    graph.add_edge(START, "analyze_metrics")
+    graph.add_edge(START, "analyze_logs")
+    graph.add_edge(["analyze_metrics", "analyze_logs"], "root_cause")
     graph.add_edge("root_cause", "recommendations")
     graph.add_edge("recommendations", "report")
     graph.add_edge("report", END)
@@ -1,23 +1,56 @@
+from detection.anomaly_engine import AnomalyEngine
 from detection.incident_detector import detect_incident
+from observability.tracing import export_trace
+from reporting.render_queue import drain_render_queue
+from utils.files import write_json_atomic
 from workflows.incident_graph import build_incident_graph
-import json
+import os
 
-incident = detect_incident("data/metrics/service_metrics.json")
+LATEST_INCIDENT_PATH = "dashboard/latest_incident.json"
 
-if incident is None:
-    print("No incident detected. Workflow skipped.")
-    exit(0)
 
-state = {
-    "incident": incident,
-    "metrics_analysis": {},
-    "log_analysis": {},
-    "root_cause": "",
-    "recommendations": []
-}
+def initial_state(incident: dict) -> dict:
+    return {
+        "incident": incident,
+        "metrics_analysis": {},
+        "log_analysis": {},
+        "root_cause": "",
+        "explanation": "",
+        "root_cause_source": "",
+        "root_cause_confidence": None,
+        "recommendations": [],
+        "trace": []
+    }
 
-graph = build_incident_graph()
-final_state = graph.invoke(state)
 
-with open("dashboard/latest_incident.json", "w") as f:
-    json.dump(final_state, f, indent=2)
+def run_incident(graph, incident: dict) -> dict:
+    final_state = graph.invoke(initial_state(incident))
+
+    # Runner workers finish incidents concurrently; the dashboard never
+    # reads a half-written file
+    write_json_atomic(LATEST_INCIDENT_PATH, final_state, indent=2)
+
+    export_trace(incident, final_state.get("trace", []))
+
+    return final_state
+
+
+def main():
+    # Opt-in: a static snapshot stops looking anomalous once the engine has
+    # learned it, so the default keeps using the labels in the file
+    engine = AnomalyEngine.load() if os.getenv("ANOMALY_DETECTION") == "1" else None
+    incident = detect_incident("data/metrics/service_metrics.json", engine)
+    if engine is not None:
+        engine.save()
+
+    if incident is None:
+        print("No incident detected. Workflow skipped.")
+        return
+
+    run_incident(build_incident_graph(), incident)
+    drain_render_queue()
+
+
+# Guarded so log ingestion worker processes can re-import this module safely
+if __name__ == "__main__":
+    main()
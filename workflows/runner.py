@@ -0,0 +1,258 @@
+# workflows/runner.py
+#
+# Incident pipeline service: detected incidents go into a bounded queue and
+# N worker processes run the incident graph on them.
+#
+#   python -m workflows.runner --workers 4 --jsonl data/metrics/stream.jsonl
+#   python -m workflows.runner --workers 4 --listen 127.0.0.1:9009
+#   python -m workflows.runner --workers 4 --incidents storm.jsonl
+
+import argparse
+import multiprocessing as mp
+import queue
+import signal
+import threading
+import time
+from typing import Callable, Optional
+
+from detection.anomaly_engine import ANOMALY_STATE_PATH, AnomalyEngine
+from detection.detector_daemon import COOLDOWN_SECONDS, StreamingDetector, follow_jsonl, listen_socket
+
+# ----------------------
+# Defaults
+# ----------------------
+
+WORKERS = max(1, (mp.cpu_count() or 2) // 2)
+QUEUE_SIZE_PER_WORKER = 4   # queued incidents per worker before submit blocks
+SHUTDOWN_TIMEOUT = 60       # seconds to finish in-flight work on shutdown
+LIVENESS_INTERVAL = 1.0     # seconds between worker checks while the queue is full
+MAX_RESTARTS = 5            # per worker slot, before submit() gives up on it
+
+
+# ----------------------
+# Worker
+# ----------------------
+
+def _worker(work: mp.Queue, results: mp.Queue):
+    # Ctrl-C goes to the whole process group; the parent decides when
+    # workers stop (a None on the queue)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    from reporting.render_queue import drain_render_queue
+    from workflows.incident_graph import build_incident_graph
+    from workflows.run_workflow import run_incident
+
+    # Compiled once per worker, reused for every incident
+    graph = build_incident_graph()
+
+    while True:
+        incident = work.get()
+        if incident is None:
+            break
+
+        started = time.perf_counter()
+        try:
+            run_incident(graph, incident)
+            error = None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        results.put((incident["incident_id"], time.perf_counter() - started, error))
+
+    # Queued PDFs belong to this process's render threads
+    drain_render_queue()
+
+
+# ----------------------
+# Runner
+# ----------------------
+
+class IncidentRunner:
+    # submit() blocks while the queue is full, so when reasoning falls behind
+    # the producer (detector, socket reader) slows down instead of memory
+    # growing. Workers are spawned, not forked: the parent may already hold
+    # SQLite connections and threads. A worker that dies (OOM kill, crash) is
+    # replaced the next time work is submitted; the incident it was running
+    # is lost. A slot that keeps dying raises instead, so a worker that can't
+    # start at all isn't respawned forever.
+
+    def __init__(self, workers: int = WORKERS, queue_size: Optional[int] = None):
+        self._ctx = mp.get_context("spawn")
+        self.work: mp.Queue = self._ctx.Queue(maxsize=queue_size or workers * QUEUE_SIZE_PER_WORKER)
+        self.results: mp.Queue = self._ctx.Queue()
+        self.processes = [self._process(i) for i in range(workers)]
+        self._restarts = [0] * workers
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.restarts = 0
+        self.busy_seconds = 0.0
+        self.started_at = 0.0
+        self._closed = False
+        self._collector = threading.Thread(target=self._collect, name="incident-results", daemon=True)
+
+    def _process(self, i: int) -> mp.Process:
+        return self._ctx.Process(target=_worker, args=(self.work, self.results), name=f"incident-worker-{i}")
+
+    def start(self) -> "IncidentRunner":
+        for p in self.processes:
+            p.start()
+        self._collector.start()
+        return self
+
+    def _replace_dead_workers(self):
+        for i, p in enumerate(self.processes):
+            if p.exitcode is not None:
+                if self._restarts[i] >= MAX_RESTARTS:
+                    raise RuntimeError(f"{p.name} keeps exiting (code {p.exitcode}), not restarting it")
+                print(f"{p.name} exited with code {p.exitcode}, starting a new one")
+                self._restarts[i] += 1
+                self.processes[i] = self._process(i)
+                self.processes[i].start()
+                self.restarts += 1
+
+    def _put(self, item, deadline: Optional[float], on_wait: Callable[[], None]):
+        # A put that wakes up every LIVENESS_INTERVAL to run on_wait, so a
+        # full queue with nobody left to drain it never blocks for good.
+        # Raises queue.Full once deadline (monotonic) passes.
+        while True:
+            wait = LIVENESS_INTERVAL
+            if deadline is not None:
+                wait = min(wait, max(0.0, deadline - time.monotonic()))
+            try:
+                self.work.put(item, timeout=wait)
+                return
+            except queue.Full:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise
+                on_wait()
+
+    def submit(self, incident: dict, timeout: Optional[float] = None):
+        # Raises queue.Full if timeout passes with the queue still full
+        if self._closed:
+            raise RuntimeError("IncidentRunner is shut down")
+        if not self.started_at:
+            # Rates are measured from the first incident, not worker startup
+            self.started_at = time.monotonic()
+        self._replace_dead_workers()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        self._put(incident, deadline, self._replace_dead_workers)
+        self.submitted += 1
+
+    def _collect(self):
+        while True:
+            item = self.results.get()
+            if item is None:
+                break
+            incident_id, seconds, error = item
+            self.completed += 1
+            self.busy_seconds += seconds
+            if error is not None:
+                self.failed += 1
+                print(f"Incident {incident_id} failed after {seconds:.1f}s: {error}")
+
+    def shutdown(self, timeout: float = SHUTDOWN_TIMEOUT):
+        # Stop accepting work, let workers finish what is queued, then stop
+        # them; anything still running after timeout is terminated
+        if self._closed:
+            return
+        self._closed = True
+        deadline = time.monotonic() + timeout
+
+        def check_workers():
+            if not any(p.is_alive() for p in self.processes):
+                raise queue.Full
+
+        # One stop marker per worker; if every worker is gone there is
+        # nobody to read them, so stop trying
+        try:
+            for _ in self.processes:
+                self._put(None, deadline, check_workers)
+        except queue.Full:
+            print("Workers are gone or stuck; queued incidents were not run")
+            # Nobody will read what is left in the pipe; don't wait on it at exit
+            self.work.cancel_join_thread()
+
+        for p in self.processes:
+            p.join(max(0.0, deadline - time.monotonic()))
+        for p in self.processes:
+            if p.is_alive():
+                p.terminate()
+                p.join()
+
+        self.results.put(None)
+        self._collector.join()
+
+    def stats(self) -> dict:
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        return {
+            "workers": len(self.processes),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "restarts": self.restarts,
+            "incidents_per_minute": round(self.completed / elapsed * 60, 1) if elapsed else 0.0,
+            "avg_seconds": round(self.busy_seconds / self.completed, 2) if self.completed else 0.0
+        }
+
+    def __enter__(self) -> "IncidentRunner":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+# ----------------------
+# Entry Point
+# ----------------------
+
+def main():
+    parser = argparse.ArgumentParser()
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--jsonl", help="JSONL metric stream to follow")
+    source.add_argument("--listen", help="HOST:PORT to accept newline-delimited JSON metrics on")
+    source.add_argument("--incidents", help="JSON or JSONL file of already detected incidents")
+    parser.add_argument("--from-start", action="store_true", help="Read the JSONL stream from the beginning")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--queue-size", type=int, default=None)
+    parser.add_argument("--cooldown", type=float, default=COOLDOWN_SECONDS)
+    parser.add_argument("--anomaly", action="store_true", help="Compute severities from raw values instead of sample labels")
+    args = parser.parse_args()
+
+    runner = IncidentRunner(args.workers, args.queue_size).start()
+    engine = AnomalyEngine.load(ANOMALY_STATE_PATH) if args.anomaly else None
+
+    # SIGTERM (service managers) shuts down like Ctrl-C
+    def on_sigterm(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, on_sigterm)
+
+    try:
+        if args.incidents:
+            from workflows.storm import load_incidents
+            for incident in load_incidents(args.incidents):
+                runner.submit(incident)
+        else:
+            if args.jsonl:
+                records = follow_jsonl(args.jsonl, from_start=args.from_start)
+            else:
+                host, port = args.listen.rsplit(":", 1)
+                records = listen_socket(host, int(port))
+
+            def on_incident(incident):
+                print(f"Incident {incident['incident_id']} ({incident['service']}, {incident['severity']}) queued")
+                runner.submit(incident)
+
+            StreamingDetector(on_incident, cooldown_seconds=args.cooldown, engine=engine).process(records)
+    except KeyboardInterrupt:
+        print("Shutting down, finishing queued incidents...")
+    finally:
+        runner.shutdown()
+        if engine is not None:
+            engine.save(ANOMALY_STATE_PATH)
+        print(runner.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,22 @@
-from typing import TypedDict, Dict, List, Any
+import operator
+from typing import Annotated, TypedDict, Dict, List, Any, Optional
+
+
+def merge_dicts(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    # Reducer for keys that parallel branches may update in the same step:
+    # later keys win, nothing is dropped
+    return {**(left or {}), **(right or {})}
 
 
 class IncidentState(TypedDict):
     incident: Dict[str, Any]
-    metrics_analysis: Dict[str, Any]
-    log_analysis: Dict[str, Any]
+    metrics_analysis: Annotated[Dict[str, Any], merge_dicts]
+    log_analysis: Annotated[Dict[str, Any], merge_dicts]
     root_cause: str
+    explanation: str
+    root_cause_source: str                  # "rules", "llm" or "rules_fallback"
+    root_cause_confidence: Optional[float]  # rule score; None for LLM answers
     recommendations: List[Dict[str, Any]]
     report_markdown: str
     report_pdf_path: str
+    trace: Annotated[List[Dict[str, Any]], operator.add]  # one span per node
@@ -0,0 +1,87 @@
+import argparse
+import json
+
+from analysis.log_ingestion import find_log_files
+from analysis.log_tail import tail_logs
+from analysis.metrics_analysis import analyze_metrics
+from reasoning.batch_reasoning import MAX_BATCH_SIZE, run_storm_reasoning
+from reasoning.root_cause_ai import root_cause_resolution, settle_root_cause
+from reasoning.rule_engine import evaluate_rules
+from recommendations.recommendation_engine import build_recommendations
+from reporting.render_queue import drain_render_queue
+from workflows.incident_graph import report_node
+from workflows.run_workflow import initial_state
+
+# ----------------------
+# Incident Storms
+# ----------------------
+# Same steps as the incident graph, but staged across all incidents at once:
+# analysis (logs tailed once per service), rules, one batched reasoning pass
+# for whatever the rules couldn't answer, then a report per incident.
+
+
+def analyze_storm(incidents: list[dict]) -> list[dict]:
+    log_analyses = {}
+    for service in dict.fromkeys(i["service"] for i in incidents):
+        log_analyses[service] = tail_logs(find_log_files(service))
+
+    states = []
+    for incident in incidents:
+        state = initial_state(incident)
+        state["metrics_analysis"] = analyze_metrics(incident["metrics_snapshot"])
+        state["log_analysis"] = log_analyses[incident["service"]]
+        states.append(state)
+    return states
+
+
+def run_storm(incidents: list[dict], batch_size: int = MAX_BATCH_SIZE) -> list[dict]:
+    states = analyze_storm(incidents)
+    rules = [evaluate_rules(s["incident"]["metrics_snapshot"], s["log_analysis"]) for s in states]
+
+    escalated = [i for i, rule in enumerate(rules) if rule is None or not rule["confident"]]
+    results = run_storm_reasoning([
+        {
+            "metrics_analysis": states[i]["metrics_analysis"],
+            "log_analysis": states[i]["log_analysis"],
+            "severity": states[i]["incident"]["severity"]
+        }
+        for i in escalated
+    ], batch_size) if escalated else []
+    answers = dict(zip(escalated, results))
+
+    for i, (state, rule) in enumerate(zip(states, rules)):
+        if i in answers:
+            resolution = settle_root_cause(rule, answers[i]["root_cause"], answers[i]["explanation"])
+        else:
+            resolution = root_cause_resolution(rule["root_cause"], rule["explanation"], "rules", rule["confidence"])
+        state.update(resolution)
+        state["recommendations"] = build_recommendations(
+            state["root_cause"], state["incident"]["severity"], state["explanation"]
+        )
+        state.update(report_node(state))
+    return states
+
+
+def load_incidents(path: str) -> list[dict]:
+    # A JSON list of incidents, or one incident per line (detector output)
+    with open(path) as f:
+        text = f.read().strip()
+    if text.startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("incidents", help="JSON or JSONL file of incidents")
+    parser.add_argument("--batch-size", type=int, default=MAX_BATCH_SIZE)
+    args = parser.parse_args()
+
+    states = run_storm(load_incidents(args.incidents), args.batch_size)
+    drain_render_queue()
+    for state in states:
+        print(f"{state['incident']['incident_id']}: {state['root_cause']}")
+
+
+if __name__ == "__main__":
+    main()